@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+"""Exact drilled areas from circle / polygon clipping
+
+   The area of a union of circles clipped to a convex polygon is the boundary
+   integral (Green's theorem) over the circle arcs that are inside the polygon
+   and not inside another circle, plus the polygon edge pieces that are inside
+   some circle.  Everything is vectorized over parts, so it holds for any
+   overlap of the main hole, corner holes and small holes.
+
+"""
+
+__author__ = "John Sheehan"
+__email__ = "jennasysen@gmail.com"
+__version__ = "1.0.0"
+__date__ = "Oct-18-2026"
+
+
+import math
+
+import numpy as np
+
+
+TWO_PI = 2 * math.pi
+
+# Parts per vectorized pass, keeps the (parts, circles, breakpoints) arrays small
+CHUNK = 2048
+
+
+def polygon_area(vertices):
+    """ shoelace area of (parts, vertices, 2) counter clockwise polygons """
+    x, y = vertices[..., 0], vertices[..., 1]
+    return 0.5 * (x * np.roll(y, -1, axis=-1) - np.roll(x, -1, axis=-1) * y).sum(axis=-1)
+
+
+def _inside_polygon(points, part, vertices, edge, tolerance):
+    # points (M, 2) of parts part against convex counter clockwise polygons, touching counts as inside
+    inside = np.ones(len(points), dtype=bool)
+    for idx in range(vertices.shape[1]):
+        vx, vy = vertices[part, idx, 0], vertices[part, idx, 1]
+        ux, uy = edge[part, idx, 0], edge[part, idx, 1]
+        inside &= (ux * (points[:, 1] - vy)) - (uy * (points[:, 0] - vx)) >= -tolerance[part]
+    return inside
+
+
+def _covered(points, part, centers, radii, tolerance, own=None):
+    # points (M, 2) of parts part: inside any circle of the part, not just touching it
+    # (radii squared are pulled in by tolerance, missing circles have a radius of 0)
+    # own is the circle each point lies on, a coincident circle with a lower index covers it
+    covered = np.zeros(len(points), dtype=bool)
+    limit = radii**2 - tolerance[:, None]
+    for idx in range(centers.shape[1]):
+        dx = points[:, 0] - centers[part, idx, 0]
+        dy = points[:, 1] - centers[part, idx, 1]
+        hit = (dx * dx) + (dy * dy) < limit[part, idx]
+        if own is not None:
+            same = (centers[part, idx] == centers[part, own]).all(axis=-1) & (radii[part, idx] == radii[part, own])
+            hit = np.where(own == idx, False, hit | (same & (idx < own)))
+        covered |= hit
+    return covered
+
+
+def _clipped_union_area(vertices, centers, radii):
+    n, circles = radii.shape
+    edges = vertices.shape[1]
+    valid = np.isfinite(radii) & np.isfinite(centers).all(axis=-1) & (radii > 0)
+    radii = np.where(valid, radii, 0.0)
+    centers = np.where(valid[..., None], centers, 0.0)
+    tolerance = 1e-12 * np.maximum(np.abs(vertices).max(axis=(1, 2)), 1.0)**2
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # Split every circle where it crosses the other circles
+        delta = centers[:, None, :, :] - centers[:, :, None, :]
+        d = np.sqrt((delta**2).sum(axis=-1))
+        ri, rj = radii[:, :, None], radii[:, None, :]
+        cross = valid[:, :, None] & valid[:, None, :] & (d < ri + rj) & (d > np.abs(ri - rj))
+        base = np.arctan2(delta[..., 1], delta[..., 0])
+        spread = np.arccos(np.clip((ri**2 + d**2 - rj**2) / (2 * ri * d), -1.0, 1.0))
+        angles = [np.where(cross, base - spread, np.nan), np.where(cross, base + spread, np.nan)]
+
+        # ... where it crosses the polygon edges, which splits the edges too
+        p = vertices[:, :, None, :]
+        u = np.roll(vertices, -1, axis=1)[:, :, None, :] - p
+        a = (u**2).sum(axis=-1)
+        b = 2 * (u * (p - centers[:, None])).sum(axis=-1)
+        c = ((p - centers[:, None])**2).sum(axis=-1) - radii[:, None]**2
+        disc = b**2 - 4 * a * c
+        # A line touching a circle doesn't split anything, and the roots of a
+        # near zero discriminant are only good to sqrt(eps) anyway
+        crossing = valid[:, None] & (disc > 1e-9 * 4 * a * radii[:, None]**2)
+        root = np.sqrt(disc)
+        edge_t = []
+        for t in ((-b - root) / (2 * a), (-b + root) / (2 * a)):
+            t = np.where(crossing & (t > 0) & (t < 1), t, np.nan)
+            edge_t.append(t)
+            point = p + t[..., None] * u
+            angles.append(np.arctan2(point[..., 1] - centers[:, None, :, 1], point[..., 0] - centers[:, None, :, 0]).transpose(0, 2, 1))
+
+        # ... and toward every vertex, in case a circle runs through one
+        offset = vertices[:, None, :, :] - centers[:, :, None, :]
+        angles.append(np.arctan2(offset[..., 1], offset[..., 0]))
+
+        # Every angle is within (-2 pi, 2 pi), missing ones sort to the end as 2 pi
+        breaks = np.concatenate(angles, axis=2)
+        breaks = np.where(np.isnan(breaks), TWO_PI, breaks)
+        breaks = np.sort(np.where(breaks < 0, breaks + TWO_PI, breaks), axis=2)
+        start = np.concatenate((np.zeros((n, circles, 1)), breaks), axis=2)
+        stop = np.concatenate((breaks, np.full((n, circles, 1), TWO_PI)), axis=2)
+
+        # Arcs inside the polygon and not inside another circle.  A point on one
+        # circle is never strictly inside it, so a circle only needs telling apart
+        # from itself when another one is drawn right on top of it
+        arcs = valid[:, :, None] & (stop > start)
+        part, circle, _ = np.nonzero(arcs)
+        start, stop = start[arcs], stop[arcs]
+        cx, cy, r = centers[part, circle, 0], centers[part, circle, 1], radii[part, circle]
+        middle = (start + stop) / 2
+        points = np.stack((cx + r * np.cos(middle), cy + r * np.sin(middle)), axis=-1)
+        edge = np.roll(vertices, -1, axis=1) - vertices
+        keep = _inside_polygon(points, part, vertices, edge, tolerance)
+        coincident = (valid[:, :, None] & valid[:, None, :] & (d == 0) & (ri == rj)).sum() > valid.sum()
+        own = circle[keep] if coincident else None
+        keep[keep] = ~_covered(points[keep], part[keep], centers, radii, tolerance, own)
+        cx, cy, r, start, stop = cx[keep], cy[keep], r[keep], start[keep], stop[keep]
+        arc = (r**2 * (stop - start)) + (cx * r * (np.sin(stop) - np.sin(start))) - (cy * r * (np.cos(stop) - np.cos(start)))
+        # bincount gives ints when nothing is left to count
+        total = np.bincount(part[keep], weights=0.5 * arc, minlength=n).astype(float)
+
+        # Polygon edge pieces inside a circle
+        t = np.concatenate(edge_t, axis=2)
+        t = np.sort(np.where(np.isnan(t), 1.0, t), axis=2)
+        t0 = np.concatenate((np.zeros((n, edges, 1)), t), axis=2)
+        t1 = np.concatenate((t, np.ones((n, edges, 1))), axis=2)
+        pieces = t1 > t0
+        part, edge, _ = np.nonzero(pieces)
+        p = vertices[part, edge]
+        u = vertices[part, (edge + 1) % edges] - p
+        a = p + t0[pieces][:, None] * u
+        b = p + t1[pieces][:, None] * u
+        inside = _covered((a + b) / 2, part, centers, radii, tolerance)
+        piece = (a[inside, 0] * b[inside, 1]) - (b[inside, 0] * a[inside, 1])
+        total += np.bincount(part[inside], weights=0.5 * piece, minlength=n)
+
+    return total
+
+
+def clipped_union_area(vertices, centers, radii):
+    """ area of the union of circles inside a convex polygon
+
+        vertices (parts, E, 2) counter clockwise, centers (parts, C, 2), radii (parts, C).
+        Circles with a zero, negative or NaN radius or center are left out.
+
+    """
+    vertices = np.asarray(vertices, dtype=float)
+    centers = np.asarray(centers, dtype=float)
+    radii = np.asarray(radii, dtype=float)
+    total = np.empty(len(radii))
+    for start in range(0, len(radii), CHUNK):
+        part = slice(start, start + CHUNK)
+        total[part] = _clipped_union_area(vertices[part], centers[part], radii[part])
+    return total
+
+
+def exact_areas(batch):
+    """ exact (overdrill, underdrill, drill2) areas for a HexHoleBatch
+
+        Matches the HexHole conventions: over and under drill areas are totals for the
+        hole, the drill2 area is the extra hex area the two small holes at one corner
+        remove.  Small holes whose position can't be solved are treated as not drilled.
+
+    """
+    n = len(batch)
+    corners = batch.corners
+    corner_xy = batch.corner_locations()
+    drills = batch.drill_locations()
+    with np.errstate(invalid='ignore'):
+        drills2 = batch.drill2_locations().reshape(n, corners, 2, 2)
+
+    # The holes are symmetric about the middle of each side, so only the half sector
+    # from the center to corner 1 and the middle of side 1 is clipped, against the
+    # main hole and the corner / small holes of corners 1, 2 and the last corner
+    nearby = [corners - 1, 0, 1]
+    centers = np.concatenate((np.zeros((n, 1, 2)), drills[:, nearby], drills2[:, nearby].reshape(n, -1, 2)), axis=1)
+    radii = np.concatenate((batch.center_to_flat[:, None],
+                            np.repeat(batch.drill_radius[:, None], len(nearby), axis=1),
+                            np.repeat(batch.drill2_radius[:, None], len(nearby) * 2, axis=1)), axis=1)
+    without_drill2 = 1 + len(nearby)
+
+    origin = np.zeros((n, 1, 2))
+    corner = corner_xy[:, :1]
+    middle = (corner_xy[:, :1] + corner_xy[:, 1:2]) / 2
+    half_sector = np.concatenate((origin, corner, middle), axis=1)
+    # Same half sector pushed out past every hole, to pick up what is drilled outside the hex
+    wedge = np.concatenate((origin, corner * 4, middle * 4), axis=1)
+
+    inside = clipped_union_area(half_sector, centers, radii)
+    outside = clipped_union_area(wedge, centers, radii) - inside
+    inside_without = clipped_union_area(half_sector, centers[:, :without_drill2], radii[:, :without_drill2])
+
+    halves = corners * 2
+    return outside * halves, (polygon_area(half_sector) - inside) * halves, (inside - inside_without) * 2
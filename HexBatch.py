@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+"""Vectorized HexHole calculations for arrays of parts"""
+
+__author__ = "John Sheehan"
+__email__ = "jennasysen@gmail.com"
+__version__ = "1.0.0"
+__date__ = "Oct-18-2026"
+
+
+import math
+
+import numpy as np
+
+from HexHole import HexHole
+
+
+# Status codes, one per part
+STATUS_OK = 0
+STATUS_DRILL_TOO_SMALL = 1
+STATUS_DRILL_TOO_LARGE = 2
+
+
+class HexHoleBatch:
+    """Object for calculating many hex drills at once
+
+       Takes arrays (or scalars, which are broadcast) of hex, drill and drill2
+       sizes and applies the same clamping and geometry as HexHole, one entry
+       per part.  Trig values that only depend on the corner are taken from
+       the math module so drill/corner coordinates, clamped sizes, flats and
+       over drill areas match the scalar class to within floating point
+       rounding.  Drill2 positions and the other areas go through NumPy's trig
+       functions and can differ from the scalar values in the last bits too.
+
+       shape is the HexHole class to follow, polygon_hole(4) for square holes
+       and so on.  Its per class trig tables are used here as well.
+
+    """
+
+    corners = HexHole.corners
+    side_angle = HexHole.side_angle
+
+    drill_increment = HexHole.drill_increment
+    min_wall = HexHole.min_wall
+
+    def __init__(self, hex_size, hole_size, hole2_size=0.0, shape=HexHole):
+        self.shape = shape
+        if shape is not HexHole:
+            self.corners = shape.corners
+            self.side_angle = shape.side_angle
+            self.min_wall = shape.min_wall
+            self.drill_increment = shape.drill_increment
+        hex_size, hole_size, hole2_size = np.broadcast_arrays(np.asarray(hex_size, dtype=float),
+                                                              np.asarray(hole_size, dtype=float),
+                                                              np.asarray(hole2_size, dtype=float))
+        self.hex_size = np.array(hex_size, ndmin=1)
+        self.requested_drill_size = np.array(hole_size, ndmin=1)
+        self.drill2_size = np.maximum(0.0, np.array(hole2_size, ndmin=1))
+        self.center_to_flat = self.hex_size / 2
+        self.center_to_corner = self.center_to_flat / shape._half_cos
+        self.corner_to_corner = self.center_to_corner * 2
+        self.flat_length = 2 * (self.center_to_flat * shape._half_tan)
+
+        grid = shape.grid
+        drill_size = self.requested_drill_size
+        too_small = self.center_to_corner - self.center_to_flat >= drill_size
+        too_large = ~too_small & (drill_size >= self.center_to_corner)
+        min_size = np.maximum(grid.above(self.center_to_corner - self.center_to_flat), grid.step)
+        max_size = grid.below(self.center_to_corner)
+
+        # A zero drill size is the best fit starting point and is clamped silently
+        self.status = np.full(drill_size.shape, STATUS_OK, dtype=np.int8)
+        self.status[too_small & (drill_size > 0.0)] = STATUS_DRILL_TOO_SMALL
+        self.status[too_large] = STATUS_DRILL_TOO_LARGE
+        self.drill_size = np.where(too_small, min_size, np.where(too_large, max_size, drill_size))
+
+        self.drill_radius = self.drill_size / 2
+        self.drill2_radius = self.drill2_size / 2
+        self.center_to_drill = self.center_to_corner - self.drill_radius
+        self._exact_areas = None
+
+
+    def __len__(self):
+        return len(self.hex_size)
+
+
+    def status_messages(self):
+        """ returns the HexHole status text for each part """
+        messages = []
+        for status, requested, actual in zip(self.status, self.requested_drill_size, self.drill_size):
+            if status == STATUS_DRILL_TOO_SMALL:
+                messages.append("Drill size {0:.4f} is too small and will be set to the minimum allowed: {1:.4f}".format(requested, actual))
+            elif status == STATUS_DRILL_TOO_LARGE:
+                messages.append("Drill size {0:.4f} is too large and will be set to the maximum allowed: {1:.4f}".format(requested, actual))
+            else:
+                messages.append("")
+        return messages
+
+
+    def _corner_trig(self):
+        return np.array(self.shape._corner_cos), np.array(self.shape._corner_sin)
+
+
+    def drill_locations(self):
+        """ returns drill coordinates as an array shaped (parts, corners, 2) """
+        cos, sin = self._corner_trig()
+        return np.stack((self.center_to_drill[:, None] * cos, self.center_to_drill[:, None] * sin), axis=-1)
+
+
+    def corner_locations(self):
+        """ returns hex corner coordinates as an array shaped (parts, corners, 2) """
+        cos, sin = self._corner_trig()
+        return np.stack((self.center_to_corner[:, None] * cos, self.center_to_corner[:, None] * sin), axis=-1)
+
+
+    def _drill2_geometry(self):
+        H = self.drill_radius * self.shape._wall_sin
+        B = self.drill_radius * self.shape._wall_cos
+        h = H - self.drill2_radius
+        C = self.drill_radius + self.drill2_radius + self.min_wall
+        with np.errstate(invalid='ignore', divide='ignore'):
+            L = np.power(C**2 - h**2, 0.5) + ((h / H) * B)
+
+        x = self.center_to_flat - self.drill2_radius
+        z = ((x / self.center_to_flat) * (self.flat_length / 2)) - L
+        return x, z
+
+
+    def drill2_angle(self):
+        x, z = self._drill2_geometry()
+        return (self.side_angle / 2) - np.degrees(np.arctan(z / x))
+
+
+    def drill2_distance(self):
+        x, z = self._drill2_geometry()
+        return np.power(z**2 + x**2, 0.5)
+
+
+    def drill2_locations(self):
+        """ returns small drill coordinates as an array shaped (parts, corners * 2, 2)
+
+            pairs are ordered like HexHole.drill2_locations: + angle then - angle for each corner
+
+        """
+        distance = self.drill2_distance()[:, None]
+        angle = self.drill2_angle()[:, None]
+        base = np.arange(self.corners) * self.side_angle
+        locations = np.empty((len(self), self.corners, 2, 2))
+        for side, sign in enumerate((1, -1)):
+            radians = np.radians(base + (sign * angle))
+            locations[:, :, side, 0] = distance * np.cos(radians)
+            locations[:, :, side, 1] = distance * np.sin(radians)
+        return locations.reshape(len(self), self.corners * 2, 2)
+
+
+    def exact_areas(self):
+        """ (overdrill, underdrill, drill2) area arrays from the exact clipping engine in HexArea """
+        if self._exact_areas is None:
+            from HexArea import exact_areas
+            self._exact_areas = exact_areas(self)
+        return self._exact_areas
+
+
+    def drill2_area(self, exact=False):
+        """ calculates the area of the hex that is removed by the small drill holes """
+        if exact:
+            return self.exact_areas()[2]
+        center_to_drill2 = self.drill2_distance()
+        outside = (center_to_drill2 - self.drill2_radius) > self.center_to_flat
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            intersecting_angle_large = np.arccos((self.center_to_flat**2 + center_to_drill2**2 - self.drill2_radius**2) / (2 * self.center_to_flat * center_to_drill2))
+            large_segment_area = (((2 * intersecting_angle_large) - np.sin(2 * intersecting_angle_large)) * (self.center_to_flat**2)) / 2
+            intersecting_angle_small = math.pi - np.arccos((self.drill2_radius**2 + center_to_drill2**2 - self.center_to_flat**2) / (2 * self.drill2_radius * center_to_drill2))
+            small_segment_area = (((2 * intersecting_angle_small) - np.sin(2 * intersecting_angle_small)) * (self.drill2_radius**2)) / 2
+
+        area = np.where(outside, (math.pi * self.drill2_radius**2) * 2, (small_segment_area - large_segment_area) * 2)
+        return np.where(self.drill2_radius == 0, 0.0, area)
+
+
+    def overdrill_area(self, exact=False):
+        """ calculates area of drilled hole that is outside of the hex area """
+        if exact:
+            return self.exact_areas()[0]
+        circle_segment_area = ((self.drill_radius**2) / 2) * self.shape._segment * 2
+        return circle_segment_area * self.corners
+
+
+    def flat(self):
+        """ calculates length of flat """
+        return (self.center_to_flat * self.shape._half_tan) * 2
+
+
+    def flat_available(self):
+        """ calculates available length of flat """
+        return self.flat() - (self.drill_size * self.shape._half_sin * 2)
+
+
+    def underdrill_area(self, exact=False):
+        """ calculates the area of the hex that is not removed with the drilled holes """
+        if exact:
+            return self.exact_areas()[1]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            intersecting_angle_large = np.arccos((self.center_to_flat**2 + self.center_to_drill**2 - self.drill_radius**2) / (2 * self.center_to_flat * self.center_to_drill))
+            large_segment_area = (((2 * intersecting_angle_large) - np.sin(2 * intersecting_angle_large)) * (self.center_to_flat**2)) / 2
+            intersecting_angle_small = math.pi - np.arccos((self.drill_radius**2 + self.center_to_drill**2 - self.center_to_flat**2) / (2 * self.drill_radius * self.center_to_drill))
+            small_segment_area = (((2 * intersecting_angle_small) - np.sin(2 * intersecting_angle_small)) * (self.drill_radius**2)) / 2
+
+        hex_area = ((self.flat_length / 2) * self.center_to_flat)
+        drill_area = ((self.center_to_flat**2) * math.pi) / self.corners
+        corner_area = small_segment_area - large_segment_area - (self.overdrill_area() / self.corners)
+        underdrill_area = hex_area - drill_area - corner_area - self.drill2_area()
+
+        return underdrill_area * self.corners
@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+"""Timings for the geometry, the best fit search and the display
+
+   Each benchmark is timed with timeit (best and median of several repeats,
+   per call) over a sweep of hex sizes or screen resolutions and the results
+   are written to a JSON file.  Passing an earlier results file compares the
+   two and exits with 1 if anything got slower than the threshold.
+
+       python HexBench.py -o bench.json
+       python HexBench.py -o new.json --compare bench.json --filter display
+
+   The display benchmarks run on SDL's dummy video driver so no window opens.
+
+"""
+
+__author__ = "John Sheehan"
+__email__ = "jennasysen@gmail.com"
+__version__ = "1.0.0"
+__date__ = "Oct-18-2026"
+
+
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+import timeit
+
+from HexHole import HexHole, polygon_hole
+import Util
+
+
+HEX_SIZES = (0.125, 0.5, 1.0, 2.0, 4.0)
+RESOLUTIONS = ((640, 480), (800, 600), (1024, 768), (1280, 1024))
+CORNERS = (4, 6, 8, 12)
+
+GEOMETRY_METHODS = ("drill_locations", "corner_locations", "drill2_angle", "drill2_distance", "drill2_locations",
+                    "drill2_area", "overdrill_area", "underdrill_area", "flat", "flat_available")
+
+
+def _hole(hex_size):
+    # Middle of the allowed drill range with a small drill that fits
+    return HexHole(hex_size, hex_size * 0.5, hex_size / 8)
+
+
+def step_fit(hex_size, ratio=1.0, inc=1.0/64.0):
+    """ the original best fit loop from HexHole.__main__, one HexHole per drill increment """
+    drill = 0.0
+    oda = 0
+    uda = 1
+    while oda / uda < ratio:
+        hole = HexHole(hex_size, drill)
+        oda = hole.overdrill_area()
+        uda = hole.underdrill_area()
+        drill = (hole.drill_size + inc) - ((hole.drill_size + inc) % inc)
+    return hole.drill_size
+
+
+def trig_locations(hole, distance):
+    """ drill or corner locations the way they were worked out before the per class trig tables, two trig calls per corner """
+    return [(distance * math.cos(math.radians(corner * hole.side_angle)), distance * math.sin(math.radians(corner * hole.side_angle)))
+            for corner in range(hole.corners)]
+
+
+def geometry_cases():
+    for hex_size in HEX_SIZES:
+        yield "hexhole_init", {"hex_size": hex_size}, lambda hex_size=hex_size: HexHole(hex_size, hex_size * 0.5, hex_size / 8)
+
+        for method in GEOMETRY_METHODS:
+            yield "hexhole." + method, {"hex_size": hex_size}, getattr(_hole(hex_size), method)
+
+        # The small drill solution is cached per size, this one pays for it every call
+        hole = _hole(hex_size)
+        def drill2_cold(hole=hole):
+            hole.drill2_size = hole.drill2_size
+            return hole.drill2_locations()
+        yield "hexhole.drill2_locations_cold", {"hex_size": hex_size}, drill2_cold
+
+
+def polygon_cases():
+    for corners in CORNERS:
+        shape = polygon_hole(corners)
+        yield "polygon_init", {"corners": corners}, lambda shape=shape: shape(1.0, 0.3, 0.04)
+        for method in ("drill_locations", "corner_locations", "drill2_locations", "underdrill_area"):
+            yield "polygon." + method, {"corners": corners}, getattr(shape(1.0, 0.3, 0.04), method)
+
+        # Baselines for the tabled locations, the angles worked out on every call
+        hole = shape(1.0, 0.3, 0.04)
+        yield "polygon.drill_locations_per_call", {"corners": corners}, lambda hole=hole: trig_locations(hole, hole.center_to_drill)
+        yield "polygon.corner_locations_per_call", {"corners": corners}, lambda hole=hole: trig_locations(hole, hole.center_to_corner)
+
+
+def fit_cases():
+    from HexFit import best_fit
+
+    for hex_size in HEX_SIZES:
+        yield "step_fit", {"hex_size": hex_size}, lambda hex_size=hex_size: step_fit(hex_size)
+        yield "best_fit", {"hex_size": hex_size}, lambda hex_size=hex_size: best_fit(hex_size, 1.0, HexHole.grid)
+
+
+def fraction_cases():
+    # getFraction is memoized, the plain case times the function itself and the cached one the lookup
+    for value in (0.0, 0.25, 0.296875, 1.015625, 3.984375):
+        yield "getFraction", {"value": value}, lambda value=value: Util.getFraction.__wrapped__(value, 64)
+        yield "getFraction_cached", {"value": value}, lambda value=value: Util.getFraction(value, 64)
+
+
+def display_cases():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    from HexDisplay import HexDisplay
+
+    pygame.init()
+    for resolution in RESOLUTIONS:
+        screen = pygame.display.set_mode(resolution)
+        params = {"width": resolution[0], "height": resolution[1]}
+        hole = _hole(0.5)
+        yield "display_init", params, lambda screen=screen, hole=hole: HexDisplay(screen, hole)
+
+        # No frame cache, every refresh redraws the layers
+        display = HexDisplay(screen, hole, cache_bytes=0)
+        drills = [0.25, 0.265625]
+        def refresh(display=display, hole=hole, drills=drills):
+            drills.reverse()
+            hole.drill_size = drills[0]
+            display.refresh()
+        yield "display_refresh", params, refresh
+
+        for mask_on in (False, True):
+            yield "display_draw", dict(params, mask_on=mask_on), lambda display=display, mask_on=mask_on: display.draw(mask_on, "0.75")
+
+
+SUITES = (geometry_cases, polygon_cases, fit_cases, fraction_cases, display_cases)
+
+
+def measure(func, repeat=5, min_time=0.2):
+    """ (best, median) seconds per call, the call count per repeat comes from timeit's autorange """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    times = [seconds / number for seconds in timer.repeat(repeat=repeat, number=number)]
+    return min(times), statistics.median(times), number
+
+
+def run(suites=SUITES, name_filter=None, repeat=5, min_time=0.2, stream=sys.stdout):
+    """ times every case of the suites, returns a list of result dicts """
+    results = []
+    for suite in suites:
+        for name, params, func in suite():
+            if name_filter and name_filter not in name:
+                continue
+            best, median, number = measure(func, repeat, min_time)
+            results.append({"name": name, "params": params, "best_us": best * 1e6, "median_us": median * 1e6, "number": number, "repeat": repeat})
+            if stream is not None:
+                stream.write("{0:<32} {1:<40} {2:>12.3f} us {3:>12.3f} us\n".format(name, _params(params), best * 1e6, median * 1e6))
+    return results
+
+
+def _params(params):
+    return " ".join("{0}={1}".format(key, value) for key, value in params.items())
+
+
+def _key(result):
+    return result["name"], json.dumps(result["params"], sort_keys=True)
+
+
+def compare(results, baseline, threshold=1.1, stream=sys.stdout):
+    """ prints best time ratios against a baseline results list, returns the cases slower than threshold """
+    previous = {_key(result): result for result in baseline}
+    slower = []
+    for result in results:
+        old = previous.get(_key(result))
+        if old is None:
+            continue
+        ratio = result["best_us"] / old["best_us"]
+        flag = ""
+        if ratio > threshold:
+            slower.append(result)
+            flag = "  SLOWER"
+        elif ratio < 1 / threshold:
+            flag = "  faster"
+        stream.write("{0:<32} {1:<40} {2:>12.3f} -> {3:>12.3f} us  x{4:.2f}{5}\n".format(result["name"], _params(result["params"]), old["best_us"], result["best_us"], ratio, flag))
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the hex hole geometry, best fit and display")
+    parser.add_argument("-o", "--output", default="bench.json", help="results file")
+    parser.add_argument("--compare", metavar="BASELINE", help="earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=1.1, help="slowdown ratio counted as a regression")
+    parser.add_argument("--filter", help="only benchmarks with this in their name")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per repeat, roughly")
+    parser.add_argument("--no-display", action="store_true", help="skip the pygame benchmarks")
+    args = parser.parse_args(argv)
+
+    suites = [suite for suite in SUITES if not (args.no_display and suite is display_cases)]
+    results = run(suites, args.filter, args.repeat, args.min_time)
+
+    with open(args.output, "w") as out:
+        json.dump({"version": __version__,
+                   "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+                   "python": platform.python_version(),
+                   "platform": platform.platform(),
+                   "machine": platform.machine(),
+                   "results": results}, out, indent=1)
+
+    if args.compare:
+        with open(args.compare) as baseline:
+            slower = compare(results, json.load(baseline)["results"], args.threshold)
+        if slower:
+            return 1
+    return 0
+
+
+
+if __name__ == "__main__":
+    sys.exit(main())
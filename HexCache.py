@@ -0,0 +1,246 @@
+#!/usr/bin/env python
+"""Persistent cache of best fit and drill pair results
+
+   Results are kept in an SQLite file keyed by polygon (corners), hex size,
+   drill catalog (the increment grid for best fit, a fingerprint of the drill
+   names and sizes for pairs), ratio target, min_wall, small drill size and
+   exact.  The file records the geometry version it was filled with, a hash
+   of the geometry sources plus GEOMETRY_VERSION and the closed form area
+   version (HexHole.area_version), and is emptied when that
+   changes so a lookup never returns an answer the current code wouldn't.
+
+   precompute fills the standard table (1/8" to 2" by 1/64" and 2 to 50 mm
+   by 0.5 mm) in one vectorized solve per polygon and ratio, after that the
+   CLI and the display answer those sizes with a lookup:
+
+       python HexCache.py precompute --corners 4 6 8 --ratios 0.8 1.0 1.2
+       python HexCache.py lookup 0.5
+       python HexCache.py stats
+
+"""
+
+__author__ = "John Sheehan"
+__email__ = "jennasysen@gmail.com"
+__version__ = "1.0.0"
+__date__ = "Oct-18-2026"
+
+
+import argparse
+import hashlib
+import importlib
+import json
+import logging
+import os
+import sqlite3
+import time
+
+import numpy as np
+
+from HexGrid import DrillGrid
+from HexHole import HexHole, polygon_hole
+
+
+# Bump to drop every cached result when the results change without the sources changing
+GEOMETRY_VERSION = 1
+
+# Modules whose code decides the cached answers
+GEOMETRY_MODULES = ("HexHole", "HexGrid", "HexBatch", "HexArea", "HexFit", "HexDrills")
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".hexhole_cache.sqlite")
+
+MM = 1 / 25.4
+
+INCH_SIZES = tuple(n / 64 for n in range(8, 129))
+METRIC_SIZES = tuple(half / 2 * MM for half in range(4, 101))
+STANDARD_SIZES = INCH_SIZES + METRIC_SIZES
+
+BEST_FIT = "best_fit"
+DRILL_PAIRS = "drill_pairs"
+
+
+def geometry_version():
+    """ GEOMETRY_VERSION, the closed form area version and a hash of the geometry module sources """
+    versions = "{0}.{1}".format(GEOMETRY_VERSION, HexHole.area_version)
+    digest = hashlib.sha1(versions.encode())
+    for name in GEOMETRY_MODULES:
+        with open(importlib.import_module(name).__file__, "rb") as source:
+            digest.update(source.read())
+    return "{0}-{1}".format(versions, digest.hexdigest()[:16])
+
+
+def _micro(size):
+    # Sizes are keyed in millionths of an inch so float noise finds the same row
+    return int(round(float(size) * 1e6))
+
+
+_shapes = {}
+
+
+def _shape(corners, min_wall):
+    # The polygon class, or a subclass with another min_wall made once per (corners, min_wall)
+    shape = polygon_hole(corners)
+    if min_wall is None or min_wall == shape.min_wall:
+        return shape
+    key = (corners, min_wall)
+    if key not in _shapes:
+        _shapes[key] = type(shape.__name__, (shape,), {"min_wall": min_wall, "__slots__": ()})
+    return _shapes[key]
+
+
+class ResultCache:
+    """Best fit drill sizes and drill pair fronts in an SQLite file
+
+       best_fit and drill_pairs take the same arguments as HexFit.best_fit and
+       HexDrills.drill_pairs (with corners and min_wall in place of the shape),
+       return a stored result when there is one and solve and store it when
+       there isn't.
+
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.hits = 0
+        self.misses = 0
+        self.version = geometry_version()
+        self._check_version()
+
+
+    def _check_version(self):
+        with self.db:
+            self.db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            self.db.execute("CREATE TABLE IF NOT EXISTS results ("
+                            "kind TEXT, corners INTEGER, hex_size INTEGER, catalog TEXT, ratio REAL, min_wall REAL,"
+                            " drill2_size INTEGER, exact INTEGER, value TEXT,"
+                            " PRIMARY KEY (kind, corners, hex_size, catalog, ratio, min_wall, drill2_size, exact)) WITHOUT ROWID")
+            row = self.db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            if row is None or row[0] != self.version:
+                if row is not None:
+                    logging.info("geometry changed ({0} -> {1}), clearing {2}".format(row[0], self.version, self.path))
+                self.db.execute("DELETE FROM results")
+                self.db.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (self.version,))
+
+
+    def close(self):
+        self.db.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+    def _get(self, keys):
+        # Stored values for a list of keys, None where there isn't one
+        values = []
+        for key in keys:
+            row = self.db.execute("SELECT value FROM results WHERE kind = ? AND corners = ? AND hex_size = ? AND catalog = ?"
+                                  " AND ratio = ? AND min_wall = ? AND drill2_size = ? AND exact = ?", key).fetchone()
+            values.append(None if row is None else json.loads(row[0]))
+        found = sum(value is not None for value in values)
+        self.hits += found
+        self.misses += len(values) - found
+        return values
+
+
+    def _put(self, keys, values):
+        with self.db:
+            self.db.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                [key + (json.dumps(value),) for key, value in zip(keys, values)])
+
+
+    def best_fit(self, hex_size, ratio=1.0, increment=HexHole.grid, drill2_size=0.0, exact=False, corners=HexHole.corners, min_wall=None):
+        """ HexFit.best_fit through the cache, works on arrays of hex sizes (misses are solved together) """
+        from HexFit import best_fit
+
+        shape = _shape(corners, min_wall)
+        scalar = np.ndim(hex_size) == 0 and np.ndim(drill2_size) == 0
+        hex_size, drill2_size = np.broadcast_arrays(np.array(hex_size, dtype=float, ndmin=1), np.array(drill2_size, dtype=float, ndmin=1))
+        keys = [(BEST_FIT, corners, _micro(size), "grid:{0}".format(DrillGrid.of(increment).name), ratio, shape.min_wall, _micro(size2), int(exact))
+                for size, size2 in zip(hex_size, drill2_size)]
+
+        values = self._get(keys)
+        missing = [idx for idx, value in enumerate(values) if value is None]
+        if missing:
+            solved = best_fit(hex_size[missing], ratio, increment, drill2_size[missing], exact, shape)
+            self._put([keys[idx] for idx in missing], solved.tolist())
+            for idx, value in zip(missing, solved.tolist()):
+                values[idx] = value
+        return values[0] if scalar else np.array(values)
+
+
+    def drill_pairs(self, hex_size, catalog=None, drill2_catalog=None, no_drill2=True, exact=False, corners=HexHole.corners, min_wall=None):
+        """ HexDrills.drill_pairs through the cache """
+        from HexDrills import DrillCatalog, drill_pairs
+
+        shape = _shape(corners, min_wall)
+        catalog = DrillCatalog.standard() if catalog is None else catalog
+        drill2_catalog = catalog if drill2_catalog is None else drill2_catalog
+        name = "{0}/{1}/{2:d}".format(catalog.fingerprint(), drill2_catalog.fingerprint(), bool(no_drill2))
+        key = (DRILL_PAIRS, corners, _micro(hex_size), name, 0.0, shape.min_wall, 0, int(exact))
+
+        value = self._get([key])[0]
+        if value is None:
+            value = [{field: (float(item) if isinstance(item, np.floating) else item) for field, item in row.items()}
+                     for row in drill_pairs(hex_size, catalog, drill2_catalog, no_drill2, exact, shape)]
+            self._put([key], [value])
+        return value
+
+
+    def precompute(self, sizes=STANDARD_SIZES, corners=(HexHole.corners,), ratios=(1.0,), pairs=True, catalog=None, exact=False):
+        """ fills the cache for every size, polygon and ratio, returns the number of results solved """
+        solved = self.misses
+        for count in corners:
+            for ratio in ratios:
+                self.best_fit(np.array(sizes), ratio, exact=exact, corners=count)
+            if pairs:
+                for size in sizes:
+                    self.drill_pairs(size, catalog, exact=exact, corners=count)
+        return self.misses - solved
+
+
+    def stats(self):
+        """ result counts by kind and corners, the geometry version and the file size """
+        rows = self.db.execute("SELECT kind, corners, COUNT(*) FROM results GROUP BY kind, corners").fetchall()
+        return {"path": self.path, "version": self.version, "bytes": os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+                "results": {"{0} {1}".format(kind, corners): count for kind, corners, count in rows},
+                "hits": self.hits, "misses": self.misses}
+
+
+    def clear(self):
+        with self.db:
+            self.db.execute("DELETE FROM results")
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute and look up cached hex hole results")
+    parser.add_argument("command", choices=("precompute", "lookup", "stats", "clear"))
+    parser.add_argument("hex_size", nargs="*", type=float, help="hex sizes to look up")
+    parser.add_argument("--path", default=DEFAULT_PATH, help="cache file")
+    parser.add_argument("--corners", nargs="+", type=int, default=[HexHole.corners])
+    parser.add_argument("--ratios", nargs="+", type=float, default=[1.0])
+    parser.add_argument("--no-pairs", action="store_true", help="only best fit drill sizes, no drill catalog pairs")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    with ResultCache(args.path) as cache:
+        start = time.perf_counter()
+        if args.command == "precompute":
+            solved = cache.precompute(corners=args.corners, ratios=args.ratios, pairs=not args.no_pairs)
+            logging.info("{0} results solved in {1:.2f} s".format(solved, time.perf_counter() - start))
+        elif args.command == "lookup":
+            for size in args.hex_size:
+                for count in args.corners:
+                    for ratio in args.ratios:
+                        drill = cache.best_fit(size, ratio, corners=count)
+                        logging.info("hex {0:.4f}  corners {1}  ratio {2:.3f}  drill {3:.6f}".format(size, count, ratio, drill))
+            logging.info("{0} hits, {1} misses in {2:.4f} s".format(cache.hits, cache.misses, time.perf_counter() - start))
+        elif args.command == "stats":
+            for key, value in cache.stats().items():
+                logging.info("{0}: {1}".format(key, value))
+        else:
+            cache.clear()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+"""Headless batch calculations for lists of hex holes
+
+   Reads part specs (hex_size, optional drill_size, drill2_size and ratio) as
+   CSV or JSON lines from a file or stdin and streams one result per part.
+   A part without a drill_size gets the best fit drill for its ratio.
+   Never imports pygame.
+
+       python HexCli.py parts.csv --format jsonl
+       echo '{"hex_size": 0.5}' | python HexCli.py - --input-format jsonl
+
+"""
+
+__author__ = "John Sheehan"
+__email__ = "jennasysen@gmail.com"
+__version__ = "1.0.0"
+__date__ = "Oct-18-2026"
+
+
+import argparse
+import csv
+import json
+import logging
+import sys
+import time
+
+from HexGrid import GRIDS
+from HexHole import HexHole, grid_hole
+
+
+def read_specs(stream, fmt):
+    """ yields one dict per part from a csv or jsonl stream """
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+    else:
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _size(spec, name, default):
+    value = spec.get(name)
+    return default if value is None or value == "" else float(value)
+
+
+def solve(spec, ratio=1.0, exact=False, cache=None, grid=HexHole.grid):
+    """ builds the HexHole for a part spec, best fitting the drill if it isn't given (from the HexCache ResultCache if there is one) """
+    hex_size = _size(spec, "hex_size", None)
+    drill2_size = _size(spec, "drill2_size", 0.0)
+    drill_size = _size(spec, "drill_size", None)
+    if drill_size is None and cache is not None:
+        drill_size = cache.best_fit(hex_size, _size(spec, "ratio", ratio), grid, drill2_size, exact)
+    elif drill_size is None:
+        from HexFit import best_fit
+        drill_size = best_fit(hex_size, _size(spec, "ratio", ratio), grid, drill2_size, exact)
+    return grid_hole(HexHole, grid)(hex_size, drill_size, drill2_size)
+
+
+def result(hole, exact=False):
+    """ calculated values for one hole as a flat dict """
+    row = {"hex_size": hole.hex_size, "drill_size": hole.drill_size, "drill2_size": hole.drill2_size}
+    for idx, (x, y) in enumerate(hole.drill_locations()):
+        row["corner{0}_x".format(idx + 1)] = round(x, 4)
+        row["corner{0}_y".format(idx + 1)] = round(y, 4)
+    if hole.drill2_radius > 0:
+        for idx, (x, y) in enumerate(hole.drill2_locations()):
+            row["small{0}_x".format(idx + 1)] = round(x, 4)
+            row["small{0}_y".format(idx + 1)] = round(y, 4)
+
+    try:
+        overdrill = hole.overdrill_area(exact)
+        underdrill = hole.underdrill_area(exact)
+        row["overdrill_area"] = round(overdrill, 6)
+        row["underdrill_area"] = round(underdrill, 6)
+        row["ratio"] = round(overdrill / underdrill, 3)
+    except (ValueError, ZeroDivisionError):
+        row["overdrill_area"] = row["underdrill_area"] = row["ratio"] = None
+    row["flat"] = round(hole.flat(), 4)
+    row["flat_available"] = round(hole.flat_available(), 4)
+    row["status"] = hole.status
+    return row
+
+
+class _CsvWriter:
+    """ csv output, the header comes from the first row (and the widest drill2 layout) """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.writer = None
+
+    def write(self, row):
+        if self.writer is None:
+            fields = list(row)
+            if "small1_x" not in fields:
+                idx = fields.index("overdrill_area")
+                fields[idx:idx] = ["small{0}_{1}".format(n + 1, axis) for n in range(HexHole.corners * 2) for axis in "xy"]
+            self.writer = csv.DictWriter(self.stream, fields, restval="")
+            self.writer.writeheader()
+        self.writer.writerow(row)
+
+
+class _JsonlWriter:
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, row):
+        self.stream.write(json.dumps(row) + "\n")
+
+
+def run(specs, out, fmt, ratio=1.0, exact=False, cache=None, grid=HexHole.grid):
+    """ streams results for specs to out, returns the number of parts """
+    writer = _CsvWriter(out) if fmt == "csv" else _JsonlWriter(out)
+    count = 0
+    for spec in specs:
+        writer.write(result(solve(spec, ratio, exact, cache, grid), exact))
+        count += 1
+    return count
+
+
+def _format(path, fmt):
+    if fmt is not None:
+        return fmt
+    return "jsonl" if path.endswith((".jsonl", ".json")) else "csv"
+
+
+def main(argv=None):
+    start = time.perf_counter()
+    parser = argparse.ArgumentParser(description="Calculate drill locations for hex holes without the display")
+    parser.add_argument("input", nargs="?", default="-", help="part specs file, - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="results file, - for stdout")
+    parser.add_argument("--input-format", choices=("csv", "jsonl"), help="default from the file extension, csv for stdin")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="output format, defaults to the input format")
+    parser.add_argument("--ratio", type=float, default=1.0, help="over/under drill ratio for parts without a drill size")
+    parser.add_argument("--grid", choices=sorted(GRIDS), default=HexHole.grid.name, help="drill size grid for best fit drills and the size clamping")
+    parser.add_argument("--exact", action="store_true", help="exact areas from the clipping engine (loads NumPy)")
+    parser.add_argument("--cache", nargs="?", const="", metavar="PATH", help="look up best fit drills in a HexCache file (default ~/.hexhole_cache.sqlite)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log timing to stderr")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    in_fmt = _format(args.input, args.input_format)
+    out_fmt = args.format or (in_fmt if args.output == "-" else _format(args.output, None))
+
+    src = sys.stdin if args.input == "-" else open(args.input, newline="")
+    dst = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    cache = None
+    if args.cache is not None:
+        from HexCache import DEFAULT_PATH, ResultCache
+        cache = ResultCache(args.cache or DEFAULT_PATH)
+    try:
+        count = run(read_specs(src, in_fmt), dst, out_fmt, args.ratio, args.exact, cache, GRIDS[args.grid])
+    finally:
+        if cache is not None:
+            logging.info("cache {0} hits, {1} misses".format(cache.hits, cache.misses))
+            cache.close()
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+
+    logging.info("{0} parts in {1:.4f} s, pygame loaded: {2}".format(count, time.perf_counter() - start, "pygame" in sys.modules))
+    return 0
+
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+"""Raster coverage map of the drilled material
+
+   Rasterizes the polygon and every drill circle (main hole, corner holes,
+   small holes) on an adaptive grid: coarse square tiles that are wholly
+   inside or outside each shape are settled at once and only the tiles that
+   straddle a boundary are split in four, level after level.  A tile is
+   settled from its center's distance to each circle and each polygon side
+   against its half diagonal, so no point sampling is needed to know that a
+   tile is all under drilled (in the polygon, in no hole), all over drilled
+   (in a hole, outside the polygon) or neither.
+
+   areas() refines until the area of the tiles still straddling a boundary
+   is within the requested error bound, counting each of them as half
+   covered, which gives an independent check on the closed form and
+   clipping engine areas.  raster() does the same down to screen pixels for
+   the heat overlay HexDisplay shows with F4: the fraction of each pixel
+   left under drilled (red) or drilled outside the polygon (blue).
+
+       python HexCoverage.py 0.5 0.25 --drill2 0.03 --tolerance 1e-5
+
+"""
+
+__author__ = "John Sheehan"
+__email__ = "jennasysen@gmail.com"
+__version__ = "1.0.0"
+__date__ = "Oct-18-2026"
+
+
+import argparse
+import logging
+import time
+
+import numpy as np
+
+from HexHole import polygon_hole
+
+
+# Tile states for under and over drill
+NONE = 0
+FULL = 1
+PARTIAL = 2
+
+# Pixel block size the raster starts from, a power of two
+BLOCK = 32
+
+# Tiles classified at a time, bounds the (tiles, circles) distance arrays
+CHUNK = 200000
+
+
+class CoverageMap:
+    """Adaptive raster of one HexHole (or polygon hole)"""
+
+    def __init__(self, hole):
+        self.hole = hole
+        circles = [(0.0, 0.0, hole.center_to_flat)]
+        circles += [(x, y, hole.drill_radius) for x, y in hole.drill_locations()]
+        if hole.drill2_radius > 0:
+            circles += [(x, y, hole.drill2_radius) for x, y in hole.drill2_locations() if np.isfinite(x) and np.isfinite(y)]
+        self.circles = np.array(circles, dtype=float)
+
+        # Sides as outward normals at center_to_flat, side k between corners k and k + 1
+        angle = np.radians((np.arange(hole.corners) + 0.5) * hole.side_angle)
+        self.normals = np.column_stack((np.cos(angle), np.sin(angle)))
+        self.extent = max(hole.center_to_corner, float(np.max(np.hypot(self.circles[:, 0], self.circles[:, 1]) + self.circles[:, 2])))
+
+
+    def _side_distance(self, x, y):
+        # Largest distance past a side, the signed distance to the polygon inside and a lower bound outside
+        return (x[:, None] * self.normals[:, 0] + y[:, None] * self.normals[:, 1]).max(axis=1) - self.hole.center_to_flat
+
+
+    def _circle_distance(self, x, y):
+        # (points, circles) distance from each circle's edge, negative inside
+        circles = self.circles
+        return np.hypot(x[:, None] - circles[:, 0], y[:, None] - circles[:, 1]) - circles[:, 2]
+
+
+    def classify(self, x, y, half):
+        """ (under, over) states of square tiles centered on x, y with half width half
+
+            The distances are 1-Lipschitz, so a tile is all on one side of a boundary
+            when its center is further from it than the half diagonal.
+
+        """
+        reach = half * np.sqrt(2)
+        side = self._side_distance(x, y)
+        inside, outside = side <= -reach, side >= reach
+        circle = self._circle_distance(x, y)
+        covered = (circle <= -reach[:, None] if np.ndim(reach) else circle <= -reach).any(axis=1)
+        uncovered = (circle >= reach[:, None] if np.ndim(reach) else circle >= reach).all(axis=1)
+
+        under = np.full(len(x), PARTIAL, dtype=np.int8)
+        under[outside | covered] = NONE
+        under[inside & uncovered] = FULL
+        over = np.full(len(x), PARTIAL, dtype=np.int8)
+        over[inside | uncovered] = NONE
+        over[outside & covered] = FULL
+        return under, over
+
+
+    def sample(self, x, y):
+        """ (under, over) booleans at points """
+        side = self._side_distance(x, y)
+        # Squared distances in single precision, plenty for a point well inside a pixel
+        x, y = x.astype(np.float32)[:, None], y.astype(np.float32)[:, None]
+        circles = self.circles.astype(np.float32)
+        covered = ((x - circles[:, 0]) ** 2 + (y - circles[:, 1]) ** 2 < circles[:, 2] ** 2).any(axis=1)
+        return (side < 0) & ~covered, (side > 0) & covered
+
+
+    def areas(self, tolerance=1e-5, tiles=16, max_level=20, chunk=CHUNK):
+        """ under and over drill areas with their error bounds, refined until both bounds are within tolerance
+
+            Tiles still straddling a boundary count as half covered, so the bound is half
+            their area.  Once one area's bound is within tolerance its open tiles are settled
+            at that and only the other area is refined further.  Returns a dict of under,
+            over, under_bound, over_bound, levels and tiles (the number of tiles classified).
+
+        """
+        size = 2 * self.extent / tiles
+        centers = (np.arange(tiles) + 0.5) * size - self.extent
+        x, y = (grid.ravel() for grid in np.meshgrid(centers, centers))
+        total = {"under": 0.0, "over": 0.0}
+        bound = {"under": 0.0, "over": 0.0}
+        active = {"under": True, "over": True}
+        count = 0
+        level = 0
+        while True:
+            area = size * size
+            states = [self.classify(x[start:start + chunk], y[start:start + chunk], size / 2) for start in range(0, len(x), chunk)]
+            count += len(x)
+            split = np.zeros(len(x), dtype=bool)
+            for layer, name in enumerate(("under", "over")):
+                if not active[name]:
+                    continue
+                state = np.concatenate([item[layer] for item in states])
+                total[name] += area * np.count_nonzero(state == FULL)
+                open_tiles = state == PARTIAL
+                open_bound = area * np.count_nonzero(open_tiles) / 2
+                if open_bound <= tolerance or level >= max_level:
+                    total[name] += open_bound
+                    bound[name] = open_bound
+                    active[name] = False
+                else:
+                    split |= open_tiles
+            if not split.any():
+                break
+
+            # Split every tile that still straddles an active boundary in four
+            x, y = x[split], y[split]
+            quarter = size / 4
+            x = np.concatenate((x - quarter, x + quarter, x - quarter, x + quarter))
+            y = np.concatenate((y - quarter, y - quarter, y + quarter, y + quarter))
+            size /= 2
+            level += 1
+
+        return {"under": total["under"], "over": total["over"], "under_bound": bound["under"], "over_bound": bound["over"],
+                "levels": level, "tiles": count}
+
+
+    def raster(self, width, height, scale, center=None, samples=4):
+        """ (width, height, 2) float32 under / over drill fraction of each pixel, indexed [x, y] like surfarray
+
+            scale is pixels per unit and center the pixel of the hole center (default the
+            middle), y points down the screen.  Blocks of BLOCK pixels are split down to
+            pixels where a boundary crosses them and those pixels are sampled on a
+            samples x samples grid.
+
+        """
+        if center is None:
+            center = (width / 2, height / 2)
+        fractions = np.zeros((width, height, 2), dtype=np.float32)
+        # Only the square the holes fit in needs looking at
+        reach = int(np.ceil(self.extent * scale)) + 1
+        left, top = max(0, int(center[0]) - reach), max(0, int(center[1]) - reach)
+        right, bottom = min(width, int(center[0]) + reach), min(height, int(center[1]) + reach)
+        if left >= right or top >= bottom:
+            return fractions
+
+        px, py = np.meshgrid(np.arange(left, right, BLOCK), np.arange(top, bottom, BLOCK), indexing="ij")
+        px, py = px.ravel(), py.ravel()
+        block = BLOCK
+        while True:
+            # Tile centers in hole units, the pixel grid is clipped at the region edge below
+            x = (px + block / 2 - center[0]) / scale
+            y = (center[1] - (py + block / 2)) / scale
+            under, over = self.classify(x, y, block / 2 / scale)
+            for state, layer in ((under, 0), (over, 1)):
+                for idx in np.flatnonzero(state == FULL):
+                    fractions[px[idx]:min(px[idx] + block, right), py[idx]:min(py[idx] + block, bottom), layer] = 1.0
+            split = (under == PARTIAL) | (over == PARTIAL)
+            px, py = px[split], py[split]
+            if block == 1:
+                break
+            block //= 2
+            px = np.concatenate((px, px + block, px, px + block))
+            py = np.concatenate((py, py, py + block, py + block))
+            keep = (px < right) & (py < bottom)
+            px, py = px[keep], py[keep]
+
+        # Pixels a boundary crosses get the fraction of their sub samples
+        if len(px):
+            offsets = (np.arange(samples) + 0.5) / samples
+            sx, sy = (grid.ravel() for grid in np.meshgrid(offsets, offsets))
+            x = ((px[:, None] + sx) - center[0]) / scale
+            y = (center[1] - (py[:, None] + sy)) / scale
+            under, over = self.sample(x.ravel(), y.ravel())
+            fractions[px, py, 0] = under.reshape(len(px), -1).mean(axis=1)
+            fractions[px, py, 1] = over.reshape(len(px), -1).mean(axis=1)
+        return fractions
+
+
+def heat_colors(fractions, alpha=160):
+    """ (rgb, alpha) uint8 arrays for a raster: under drill red, over drill blue, alpha by fraction """
+    rgb = np.zeros(fractions.shape[:2] + (3,), dtype=np.uint8)
+    rgb[..., 0] = 255 * (fractions[..., 0] > 0)
+    rgb[..., 2] = 255 * (fractions[..., 1] > 0)
+    return rgb, (np.maximum(fractions[..., 0], fractions[..., 1]) * alpha).astype(np.uint8)
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Under and over drill areas from an adaptive raster, against the closed form and exact areas")
+    parser.add_argument("hex_size", type=float)
+    parser.add_argument("drill_size", type=float)
+    parser.add_argument("--drill2", type=float, default=0.0, help="small drill size")
+    parser.add_argument("--corners", type=int, default=6)
+    parser.add_argument("--tolerance", type=float, default=1e-5, help="error bound on each area")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    hole = polygon_hole(args.corners)(args.hex_size, args.drill_size, args.drill2)
+    if hole.status:
+        logging.warning(hole.status)
+
+    start = time.perf_counter()
+    result = CoverageMap(hole).areas(args.tolerance)
+    seconds = time.perf_counter() - start
+    exact_over, exact_under, _ = hole.exact_areas()
+    logging.info("{0:<12} {1:>12} {2:>12} {3:>12} {4:>12}".format("", "raster", "bound", "closed form", "exact"))
+    logging.info("{0:<12} {1:12.8f} {2:12.2e} {3:12.8f} {4:12.8f}".format("under drill", result["under"], result["under_bound"], hole.underdrill_area(), exact_under))
+    logging.info("{0:<12} {1:12.8f} {2:12.2e} {3:12.8f} {4:12.8f}".format("over drill", result["over"], result["over_bound"], hole.overdrill_area(), exact_over))
+    logging.info("{0} levels, {1} tiles in {2:.3f} s".format(result["levels"], result["tiles"], seconds))
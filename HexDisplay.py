@@ -0,0 +1,469 @@
+#!/usr/bin/env python
+"""PyGame display of a HexHole"""
+
+__author__ = "John Sheehan"
+__email__ = "jennasysen@gmail.com"
+__version__ = "1.2.0"
+__date__ = "Oct-18-2026"
+
+
+import pygame
+import collections
+import logging
+import threading
+import time
+
+import Util
+
+
+class HexDisplay:
+    """Layered drawing of a HexHole
+
+       The layer surfaces, fonts and fixed labels are made once per screen.
+       refresh() compares the hex, drill and drill2 sizes with the last ones
+       drawn and only redraws the layers and labels that depend on what changed:
+
+           hex size      everything (the scale changes)
+           drill size    hex/holes background, mask, overlay, corner and flat labels
+           drill2 size   small hole layer and its label
+
+       The area labels depend on all three and are redrawn on any change.
+
+       The layers and labels are then composed into a frame, with and without
+       the mask, and kept in an LRU cache keyed by the sizes and the screen
+       size, so going back to a recent configuration is a single blit.
+       cache_bytes is the memory budget for the cached frames, by default
+       enough for CACHE_FRAMES (frame, masked frame) pairs of the screen size
+       and at least 64 MB.
+
+       After start_worker() frames are made on a background thread instead:
+       submit() queues the current sizes, the newest job replaces any that
+       hasn't started, and show() takes the finished frame from the
+       FRAME_READY event.  draw() keeps showing the last finished frame.
+
+    """
+
+    # Color list
+    TRANSPARENT = (255,0,255)
+    RED = (255,0,0)
+    GREEN = (0,255,0)
+    DARKGREEN = (0,128,0)
+    BLUE = (0,0,255)
+    DARKBLUE = (0,0,128)
+    WHITE = (255,255,255)
+    BLACK = (0,0,0)
+    PINK = (255,200,200)
+    YELLOW = (255, 255, 0)
+
+    # Posted by the worker thread when a submitted frame is ready
+    FRAME_READY = pygame.USEREVENT
+
+    # Frame pairs the default cache budget holds: the shown frame and its four neighbors,
+    # twice over so the previous configuration's are still there when going back
+    CACHE_FRAMES = 10
+
+    def __init__(self, screen, hexhole, cache_bytes=None):
+        self.screen = screen
+        self.hexhole = hexhole
+        self.sizes = None
+        self.layer_sizes = None
+        if cache_bytes is None:
+            cache_bytes = max(64 * 1024 * 1024, HexDisplay.CACHE_FRAMES * 2 * screen.get_pitch() * screen.get_height())
+        self.frames = Util.LRUCache(max_size=1024, max_bytes=cache_bytes, size_of=HexDisplay._frame_bytes)
+        self.frame = None
+        self._neighbors = None
+        self.coverage = None
+        self.coverage_key = None
+        self.worker = None
+
+        # Milliseconds for the last refreshes and draws, for frame time logging
+        self.refresh_times = collections.deque(maxlen=100)
+        self.draw_times = collections.deque(maxlen=100)
+
+        self.x_screen = screen.get_size()[0]
+        self.y_screen = screen.get_size()[1]
+        self.border = int(self.x_screen * 0.025)
+        self.x_center = int(self.x_screen / 2)
+        self.y_center = int(self.y_screen / 2)
+        self.center_mark = int(self.x_screen * 0.015)
+
+        self.background = pygame.Surface(screen.get_size())
+        self.drill2_layer = pygame.Surface(screen.get_size())
+        self.drill2_layer.set_colorkey(HexDisplay.TRANSPARENT)
+        self.mask = pygame.Surface(screen.get_size())
+        self.mask.set_colorkey(HexDisplay.TRANSPARENT)
+        self.overlay = pygame.Surface(screen.get_size())
+        self.overlay.set_colorkey(HexDisplay.TRANSPARENT)
+
+        #Text
+        self.f_Info = HexDisplay.font("Arial", int(self.x_screen * 0.02))
+        self.f_InfoI = HexDisplay.font("Arial", int(self.x_screen * 0.015), italic=True)
+
+        self.lblInstructionsHex = self._label(self.f_InfoI, "Type a number and press [ Enter ] to change the hex size", HexDisplay.DARKGREEN)
+        self.lblInstructionsHexRect = self.lblInstructionsHex.get_rect()
+        self.lblInstructionsHexRect.right = self.x_screen - self.border
+        self.lblInstructionsHexRect.top = self.border
+        self.lblInstructionsSize = self._label(self.f_InfoI, "Press Up/Down arrows to change corner drill size", HexDisplay.DARKGREEN)
+        self.lblInstructionsSizeRect = self.lblInstructionsSize.get_rect()
+        self.lblInstructionsSizeRect.right = self.x_screen - self.border
+        self.lblInstructionsSizeRect.top = self.border * 2
+        self.lblInstructionsSize2 = self._label(self.f_InfoI, "Press Left/Right arrows to change small drill size", HexDisplay.DARKGREEN)
+        self.lblInstructionsSize2Rect = self.lblInstructionsSize.get_rect()
+        self.lblInstructionsSize2Rect.right = self.x_screen - self.border
+        self.lblInstructionsSize2Rect.top = self.border * 3
+        self.lblInstructionsMask = self._label(self.f_InfoI, "Press [ space bar ] to toggle overlay", HexDisplay.DARKGREEN)
+        self.lblInstructionsMaskRect = self.lblInstructionsMask.get_rect()
+        self.lblInstructionsMaskRect.right = self.x_screen - self.border
+        self.lblInstructionsMaskRect.top = self.border * 4
+
+        self.refresh()
+
+
+    @staticmethod
+    def font(face, size, italic=False):
+        """ cached SysFont """
+        return Util.getFont(face, size, italic)
+
+
+    @staticmethod
+    def _label(font, text, color):
+        # SDL_ttf isn't thread safe and labels are also rendered on the worker thread
+        with Util.font_lock:
+            return font.render(text, True, color)
+
+
+    def refresh(self):
+        """ makes the frame for the current sizes, from the cache or by redrawing what changed, returns True if anything changed """
+        hexhole = self.hexhole
+        sizes = (hexhole.hex_size, hexhole.drill_size, hexhole.drill2_size)
+        if sizes == self.sizes:
+            return False
+
+        start = time.perf_counter()
+        self.sizes = sizes
+        self.frame = self._frame(hexhole)
+        self._neighbors = self._neighbor_sizes(hexhole)
+        self.refresh_times.append((time.perf_counter() - start) * 1000)
+        return True
+
+
+    def _frame(self, hexhole):
+        """ cached (frame, masked frame) for hexhole, drawn on the layers if it isn't cached """
+        key = (hexhole.hex_size, hexhole.drill_size, hexhole.drill2_size) + self.screen.get_size()
+        frame = self.frames.get(key)
+        if frame is None:
+            self._update_layers(hexhole)
+            frame = self._compose()
+            self.frames.put(key, frame)
+        return frame
+
+
+    @staticmethod
+    def _frame_bytes(frame):
+        return sum(surface.get_pitch() * surface.get_height() for surface in frame)
+
+
+    def _update_layers(self, hexhole):
+        """ redraws the layers and labels affected by size changes since they were last drawn """
+        sizes = (hexhole.hex_size, hexhole.drill_size, hexhole.drill2_size)
+        hex_changed = self.layer_sizes is None or sizes[0] != self.layer_sizes[0]
+        drill_changed = hex_changed or sizes[1] != self.layer_sizes[1]
+        self.layer_sizes = sizes
+        self.layer_hole = hexhole
+
+        if hex_changed:
+            self.scale_factor = (self.y_screen / hexhole.corner_to_corner) / 1.2
+            self.hex_points = [(int(x * self.scale_factor) + self.x_center, int(y * self.scale_factor) + self.y_center) for x, y in hexhole.corner_locations()]
+            self.lblHexSize = self._label(self.f_Info, "Hex Size: {0:.4f}".format(hexhole.hex_size), HexDisplay.DARKBLUE)
+
+        if drill_changed:
+            self._draw_holes()
+            self._render_drill_labels()
+
+        self._draw_drill2()
+        self.lblHole2Size = self._label(self.f_Info, "Small Hole Size: {0:.4f}  ({1})".format(hexhole.drill2_size, hexhole.grid.label(hexhole.drill2_size)), HexDisplay.DARKBLUE)
+        self._render_area_labels()
+
+
+    def _compose(self):
+        """ everything but the input box and status line, returns (frame, masked frame) """
+        frame = self.background.copy()
+        self._compose_on(frame)
+
+        masked = frame.copy()
+        masked.blit(self.mask, (0, 0))
+        return frame, masked
+
+
+    def _compose_on(self, frame, instructions=True):
+        """ blits the layers and labels over the background already on frame """
+        frame.blit(self.drill2_layer, (0, 0))
+        frame.blit(self.overlay, (0, 0))
+
+        frame.blit(self.lblHexSize, (self.border, self.border))
+        frame.blit(self.lblHoleSize, (self.border, self.border * 3))
+        frame.blit(self.lblHole2Size, (self.border, self.border * 4))
+        if instructions:
+            frame.blit(self.lblInstructionsSize, self.lblInstructionsSizeRect)
+            frame.blit(self.lblInstructionsSize2, self.lblInstructionsSize2Rect)
+            frame.blit(self.lblInstructionsHex, self.lblInstructionsHexRect)
+            frame.blit(self.lblInstructionsMask, self.lblInstructionsMaskRect)
+        frame.blit(self.lblOverDrill, (self.x_screen - int(self.x_screen * 0.25), self.y_screen - (self.border * 4)))
+        frame.blit(self.lblUnderDrill, (self.x_screen - int(self.x_screen * 0.25), self.y_screen - (self.border * 3)))
+        frame.blit(self.lblRatio, (self.x_screen - int(self.x_screen * 0.25), self.y_screen - (self.border * 2)))
+        frame.blit(self.lblFlat, self.lblFlatRect)
+
+        for pos in range(self.layer_hole.corners):
+            frame.blit(self.lblCorners[pos], (self.border, self.y_screen - (self.border * self.layer_hole.corners) - self.border + (self.border * pos)))
+            frame.blit(self.lblCornersTag[pos], (self.drill_points[pos][0] + int(self.center_mark / 2), self.drill_points[pos][1] + int(self.center_mark / 2)))
+
+
+    @staticmethod
+    def _neighbor_sizes(hexhole):
+        """ sizes with the drill or small drill one increment up or down, the same steps as the arrow keys """
+        grid = hexhole.grid
+        hex_size, drill, drill2 = hexhole.hex_size, hexhole.drill_size, hexhole.drill2_size
+        return [(hex_size, grid.up(drill), drill2),
+                (hex_size, grid.down(drill), drill2),
+                (hex_size, drill, grid.up(drill2)),
+                (hex_size, drill, grid.down(drill2))]
+
+
+    def prerender_next(self):
+        """ renders one uncached neighbor of the last frame made, returns False when there are none left """
+        if not self._neighbors:
+            return False
+
+        neighbor = type(self.hexhole)(*self._neighbors.pop(0))
+        if (neighbor.hex_size, neighbor.drill_size, neighbor.drill2_size) + self.screen.get_size() not in self.frames:
+            self._frame(neighbor)
+        return True
+
+
+    def start_worker(self):
+        """ moves frame making to a background thread, see submit() and show() """
+        self._jobs = threading.Condition()
+        self._job = None
+        self._stopped = False
+        self.generation = 0
+        self.submitted = self.sizes
+        self.worker = threading.Thread(target=self._work, name="HexDisplay worker", daemon=True)
+        self.worker.start()
+
+
+    def stop_worker(self):
+        with self._jobs:
+            self._stopped = True
+            self._jobs.notify()
+        self.worker.join()
+        self.worker = None
+
+
+    def submit(self):
+        """ queues a frame for the current HexHole sizes, replacing any job that hasn't started yet
+
+            The frame comes back as a FRAME_READY event.  Returns True if a job was queued.
+
+        """
+        hexhole = self.hexhole
+        sizes = (hexhole.hex_size, hexhole.drill_size, hexhole.drill2_size)
+        if sizes == self.submitted:
+            return False
+        self.submitted = sizes
+        with self._jobs:
+            self.generation += 1
+            self._job = (self.generation, sizes)
+            self._jobs.notify()
+        return True
+
+
+    def show(self, event):
+        """ takes the frame from a FRAME_READY event, returns False if newer sizes were submitted since """
+        if event.generation != self.generation:
+            return False
+        self.sizes = event.sizes
+        self.frame = event.frame
+        self.refresh_times.append(event.ms)
+        return True
+
+
+    def _work(self):
+        while True:
+            with self._jobs:
+                while self._job is None and not self._stopped and not self._neighbors:
+                    self._jobs.wait()
+                if self._stopped:
+                    return
+                job, self._job = self._job, None
+
+            # Neighbors are only rendered while there is nothing newer to do
+            if job is None:
+                self.prerender_next()
+                continue
+
+            generation, sizes = job
+            start = time.perf_counter()
+            hexhole = type(self.hexhole)(*sizes)
+            frame = self._frame(hexhole)
+            self._neighbors = self._neighbor_sizes(hexhole)
+            if generation == self.generation:
+                pygame.event.post(pygame.event.Event(HexDisplay.FRAME_READY, generation=generation, sizes=sizes, frame=frame, ms=(time.perf_counter() - start) * 1000))
+
+
+    def _draw_holes(self):
+        """ hex, main hole and corner holes: background, mask and overlay layers """
+        hexhole = self.layer_hole
+        self.background.fill(HexDisplay.WHITE)
+        self.mask.fill(HexDisplay.TRANSPARENT)
+        self.overlay.fill(HexDisplay.TRANSPARENT)
+
+        # Draw desired hex
+        pygame.draw.polygon(self.background, HexDisplay.BLACK, self.hex_points, 0)
+
+        # Draw main hole
+        pygame.draw.circle(self.background, HexDisplay.WHITE, (self.x_center, self.y_center), int(hexhole.center_to_flat * self.scale_factor), 0)
+        pygame.draw.circle(self.background, HexDisplay.RED, (self.x_center, self.y_center), int(hexhole.center_to_flat * self.scale_factor), 1)
+        pygame.draw.line(self.background, HexDisplay.RED, (self.x_center - self.center_mark, self.y_center), (self.x_center + self.center_mark, self.y_center), 1)
+        pygame.draw.line(self.background, HexDisplay.RED, (self.x_center, self.y_center - self.center_mark), (self.x_center, self.y_center + self.center_mark), 1)
+
+        # Draw corner holes
+        self.drill_points = [(int(x * self.scale_factor) + self.x_center, int(-y * self.scale_factor) + self.y_center) for x, y in hexhole.drill_locations()]
+        for pos in range(hexhole.corners):
+            pygame.draw.circle(self.mask, HexDisplay.WHITE, (self.drill_points[pos][0],self.drill_points[pos][1]), int(hexhole.drill_radius * self.scale_factor), 0)
+            pygame.draw.circle(self.mask, HexDisplay.BLUE, (self.drill_points[pos][0],self.drill_points[pos][1]), int(hexhole.drill_radius * self.scale_factor), 1)
+            pygame.draw.circle(self.overlay, HexDisplay.BLUE, (self.drill_points[pos][0],self.drill_points[pos][1]), int(hexhole.drill_radius * self.scale_factor), 0)
+            pygame.draw.circle(self.overlay, HexDisplay.BLUE, (self.drill_points[pos][0],self.drill_points[pos][1]), int(hexhole.drill_radius * self.scale_factor), 1)
+            pygame.draw.circle(self.background, HexDisplay.WHITE, (self.drill_points[pos][0],self.drill_points[pos][1]), int(hexhole.drill_radius * self.scale_factor), 0)
+            pygame.draw.circle(self.background, HexDisplay.BLUE, (self.drill_points[pos][0],self.drill_points[pos][1]), int(hexhole.drill_radius * self.scale_factor), 1)
+            pygame.draw.line(self.background, HexDisplay.BLUE, (self.drill_points[pos][0] - self.center_mark, self.drill_points[pos][1]), (self.drill_points[pos][0] + self.center_mark, self.drill_points[pos][1]), 1)
+            pygame.draw.line(self.background, HexDisplay.BLUE, (self.drill_points[pos][0], self.drill_points[pos][1] - self.center_mark), (self.drill_points[pos][0], self.drill_points[pos][1] + self.center_mark), 1)
+
+        #Overlays
+        pygame.draw.polygon(self.overlay, HexDisplay.TRANSPARENT, self.hex_points, 0)
+        # pygame.draw.polygon(mask, HexDisplay.RED, hex_points, 1)
+        pygame.draw.polygon(self.overlay, HexDisplay.BLACK, self.hex_points, 1)
+        pygame.draw.circle(self.mask, HexDisplay.WHITE, (self.x_center, self.y_center), int(hexhole.center_to_flat * self.scale_factor), 0)
+
+
+    def _draw_drill2(self):
+        """ small hole outlines, drawn between the background and the overlay """
+        hexhole = self.layer_hole
+        self.drill2_layer.fill(HexDisplay.TRANSPARENT)
+        if hexhole.drill2_radius > 0:
+            self.drill2_points = [(int(x * self.scale_factor) + self.x_center, int(-y * self.scale_factor) + self.y_center) for x, y in hexhole.drill2_locations()]
+            tmp_color = HexDisplay.RED
+            for pos in range(hexhole.corners * 2):
+                pygame.draw.circle(self.drill2_layer, tmp_color, (self.drill2_points[pos][0],self.drill2_points[pos][1]), int(hexhole.drill2_radius * self.scale_factor), 1)
+                tmp_color = HexDisplay.BLUE
+        else:
+            self.drill2_points = []
+
+
+    def _render_drill_labels(self):
+        hexhole = self.layer_hole
+        self.lblHoleSize = self._label(self.f_Info, "Corner Hole Size: {0:.4f}  ({1})".format(hexhole.drill_size, hexhole.grid.label(hexhole.drill_size)), HexDisplay.DARKBLUE)
+
+        flat = hexhole.flat()
+        flat_avail = hexhole.flat_available()
+        self.lblFlat = self._label(self.f_Info, "Flat Length: {0:.3f}   ({1:.1%})".format(flat_avail, flat_avail / flat), HexDisplay.DARKBLUE)
+        self.lblFlatRect = self.lblFlat.get_rect()
+        self.lblFlatRect.centerx = self.screen.get_rect().centerx
+        self.lblFlatRect.top = self.y_screen - (self.border * 2)
+
+        self.lblCorners = []
+        self.lblCornersTag = []
+        for idx, hole in enumerate(hexhole.drill_locations()):
+            self.lblCorners.append(self._label(self.f_Info, "Corner {0}: X={1:.4f}  Y={2:.4f}".format(idx + 1, hole[0], hole[1]), HexDisplay.DARKBLUE))
+            self.lblCornersTag.append(self._label(self.f_Info, "{0}".format(idx + 1), HexDisplay.DARKBLUE))
+
+
+    def _render_area_labels(self):
+        hexhole = self.layer_hole
+        overdrill = hexhole.overdrill_area()
+        underdrill = hexhole.underdrill_area()
+        self.lblOverDrill = self._label(self.f_Info, "Over drill area: {0:.6f}".format(overdrill), HexDisplay.DARKBLUE)
+        self.lblUnderDrill = self._label(self.f_Info, "Under drill area: {0:.6f}".format(underdrill), HexDisplay.DARKBLUE)
+        self.lblRatio = self._label(self.f_Info, "Ratio: {0:.3f}".format(overdrill / underdrill), HexDisplay.DARKBLUE)
+
+
+    def render_to(self, surface, hexhole, mask_on=False, instructions=False):
+        """ draws hexhole onto a surface the size of the screen, without the frame cache or new surfaces
+
+            For setup sheets: the layers are redrawn as needed and composed straight onto
+            surface, the keyboard instructions are left out unless asked for.  The status
+            line is drawn if hexhole has one.
+
+        """
+        self._update_layers(hexhole)
+        surface.blit(self.background, (0, 0))
+        self._compose_on(surface, instructions)
+        if mask_on:
+            surface.blit(self.mask, (0, 0))
+        if len(hexhole.status) > 0:
+            status_text = Util.renderText("Arial", int(self.x_screen * 0.018), hexhole.status, HexDisplay.RED)
+            status_rect = status_text.get_rect()
+            status_rect.centerx = self.screen.get_rect().centerx
+            status_rect.top = self.y_screen - self.border
+            surface.blit(status_text, status_rect)
+
+
+    def draw(self, mask_on, input_text):
+        start = time.perf_counter()
+        # pygame.display.update()
+        self.screen.blit(self.frame[1] if mask_on else self.frame[0], (0, 0))
+        Util.inputbox(self.screen, "New Size: ", input_text, (self.border, self.border * 2), int(self.x_screen * 0.14), HexDisplay.YELLOW, HexDisplay.DARKBLUE)
+
+        if len(self.hexhole.status) > 0:
+            status_text = Util.renderText("Arial", int(self.x_screen * 0.018), self.hexhole.status, HexDisplay.RED)
+            status_rect = status_text.get_rect()
+            status_rect.centerx = self.screen.get_rect().centerx
+            status_rect.top = self.y_screen - self.border
+            self.screen.blit(status_text, status_rect)
+            logging.warning(self.hexhole.status)
+            # print(self.hexhole.status)
+
+        self.draw_times.append((time.perf_counter() - start) * 1000)
+
+
+    def draw_input(self, mask_on, input_text):
+        """ redraws only the screen strip holding the input box, returns the rect to update """
+        rect = pygame.Rect(0, self.border * 2, self.x_screen, self.border)
+        self.screen.set_clip(rect)
+        self.draw(mask_on, input_text)
+        self.screen.set_clip(None)
+        return rect
+
+
+    def draw_coverage(self, samples=4):
+        """ blits the HexCoverage heat map of the frame on screen: under drill red, over drill blue
+
+            The map is only worked out again when the shown sizes change.
+
+        """
+        from HexCoverage import CoverageMap, heat_colors
+
+        key = self.sizes + self.screen.get_size()
+        if key != self.coverage_key:
+            start = time.perf_counter()
+            hexhole = type(self.hexhole)(*self.sizes)
+            scale = (self.y_screen / hexhole.corner_to_corner) / 1.2
+            fractions = CoverageMap(hexhole).raster(self.x_screen, self.y_screen, scale, (self.x_center, self.y_center), samples)
+            if self.coverage is None or self.coverage.get_size() != self.screen.get_size():
+                self.coverage = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
+            rgb, alpha = heat_colors(fractions)
+            pixels = pygame.surfarray.pixels3d(self.coverage)
+            pixels[...] = rgb
+            del pixels
+            pixels = pygame.surfarray.pixels_alpha(self.coverage)
+            pixels[...] = alpha
+            del pixels
+            self.coverage_key = key
+            logging.debug("coverage map: {0:.2f} ms".format((time.perf_counter() - start) * 1000))
+        self.screen.blit(self.coverage, (0, 0))
+
+
+    def frame_stats(self):
+        """ average refresh and draw milliseconds over the recent frames """
+        refresh = sum(self.refresh_times) / len(self.refresh_times) if self.refresh_times else 0.0
+        draw = sum(self.draw_times) / len(self.draw_times) if self.draw_times else 0.0
+        return refresh, draw
@@ -0,0 +1,255 @@
+#!/usr/bin/env python
+"""Corner and small drill pairs picked from a drill catalog
+
+   Every feasible (corner drill, small drill) pair from the catalog is
+   evaluated in one HexHoleBatch and the pairs that no other pair beats on
+   over drill area, under drill area and available flat (lower, lower,
+   higher) are returned as the Pareto front.
+
+       python HexDrills.py 0.5
+       python HexDrills.py 0.5 --sets fractional letter --catalog rack.csv --no-drill2
+
+"""
+
+__author__ = "John Sheehan"
+__email__ = "jennasysen@gmail.com"
+__version__ = "1.0.0"
+__date__ = "Oct-18-2026"
+
+
+import argparse
+import csv
+import hashlib
+import logging
+import math
+import time
+
+import numpy as np
+
+from HexBatch import HexHoleBatch, STATUS_OK
+from HexHole import HexHole
+
+
+MM = 1 / 25.4
+
+FRACTIONAL = [("{0}/{1}".format(n // math.gcd(n, 64), 64 // math.gcd(n, 64)) if n < 64 else "1", n / 64) for n in range(1, 65)]
+
+NUMBER = [("#{0}".format(idx + 1), size) for idx, size in enumerate((
+    0.2280, 0.2210, 0.2130, 0.2090, 0.2055, 0.2040, 0.2010, 0.1990, 0.1960, 0.1935,
+    0.1910, 0.1890, 0.1850, 0.1820, 0.1800, 0.1770, 0.1730, 0.1695, 0.1660, 0.1610,
+    0.1590, 0.1570, 0.1540, 0.1520, 0.1495, 0.1470, 0.1440, 0.1405, 0.1360, 0.1285,
+    0.1200, 0.1160, 0.1130, 0.1110, 0.1100, 0.1065, 0.1040, 0.1015, 0.0995, 0.0980,
+    0.0960, 0.0935, 0.0890, 0.0860, 0.0820, 0.0810, 0.0785, 0.0760, 0.0730, 0.0700,
+    0.0670, 0.0635, 0.0595, 0.0550, 0.0520, 0.0465, 0.0430, 0.0420, 0.0410, 0.0400,
+    0.0390, 0.0380, 0.0370, 0.0360, 0.0350, 0.0330, 0.0320, 0.0310, 0.0292, 0.0280,
+    0.0260, 0.0250, 0.0240, 0.0225, 0.0210, 0.0200, 0.0180, 0.0160, 0.0145, 0.0135))]
+
+LETTER = list(zip("ABCDEFGHIJKLMNOPQRSTUVWXYZ", (
+    0.234, 0.238, 0.242, 0.246, 0.250, 0.257, 0.261, 0.266, 0.272, 0.277, 0.281, 0.290, 0.295,
+    0.302, 0.316, 0.323, 0.332, 0.339, 0.348, 0.358, 0.368, 0.377, 0.386, 0.397, 0.404, 0.413)))
+
+# Jobber sets: 0.1 mm steps to 13 mm, then 0.5 mm steps to 25 mm
+METRIC = [("{0:.1f}mm".format(mm / 10), mm / 10 * MM) for mm in list(range(5, 131)) + list(range(135, 251, 5))]
+
+SETS = {"fractional": FRACTIONAL, "number": NUMBER, "letter": LETTER, "metric": METRIC}
+
+
+def parse_size(text):
+    """ drill size in inches from '0.25', '1/4', '1-1/4' or '6.5mm' """
+    text = text.strip().lower()
+    if text.endswith("mm"):
+        return float(text[:-2]) * MM
+    whole, _, fraction = text.rpartition("-") if "/" in text else ("", "", text)
+    if "/" in fraction:
+        numerator, denominator = fraction.split("/")
+        return float(whole or 0) + float(numerator) / float(denominator)
+    return float(fraction)
+
+
+class DrillCatalog:
+    """Named drill sizes in inches, sorted by size"""
+
+    def __init__(self, drills):
+        drills = sorted(drills, key=lambda drill: drill[1])
+        self.names = [name for name, _ in drills]
+        self.sizes = np.array([size for _, size in drills], dtype=float)
+
+
+    def __len__(self):
+        return len(self.names)
+
+
+    @classmethod
+    def standard(cls, sets=("fractional", "number", "letter", "metric")):
+        return cls([drill for name in sets for drill in SETS[name]])
+
+
+    @classmethod
+    def from_file(cls, path):
+        """ csv of name,size lines (size as parse_size takes it), a line with only a size is named by it """
+        drills = []
+        with open(path, newline="") as stream:
+            for row in csv.reader(stream):
+                row = [cell for cell in row if cell.strip()]
+                if not row or row[0].startswith("#") and len(row) == 1:
+                    continue
+                try:
+                    drills.append((row[0].strip(), parse_size(row[-1])))
+                except ValueError:
+                    # Header line
+                    continue
+        return cls(drills)
+
+
+    def fingerprint(self):
+        """ short hash of the names and sizes, for cache keys """
+        text = ";".join("{0}={1!r}".format(name, float(size)) for name, size in zip(self.names, self.sizes))
+        return hashlib.sha1(text.encode()).hexdigest()[:16]
+
+
+    def __add__(self, other):
+        return DrillCatalog(list(zip(self.names, self.sizes)) + list(zip(other.names, other.sizes)))
+
+
+def evaluate_pairs(hex_size, catalog, drill2_catalog=None, no_drill2=True, exact=False, shape=HexHole):
+    """ every feasible catalog pair for hex_size, returns a dict of arrays
+
+        Corner drills have to be in the allowed range (no clamping).  Small drills
+        come from drill2_catalog (default: the same catalog), plus no small drill
+        if no_drill2.  A pair is feasible when the small holes can be placed, stay
+        min_wall clear of the corner holes and of each other, and something is
+        left to under drill.  shape is the HexHole class (polygon).
+
+    """
+    drill2_catalog = catalog if drill2_catalog is None else drill2_catalog
+    limits = HexHoleBatch(hex_size, [0.0, np.inf], shape=shape)
+    allowed = (catalog.sizes >= limits.drill_size[0]) & (catalog.sizes <= limits.drill_size[1])
+    drills = np.flatnonzero(allowed)
+    drills2 = np.arange(len(drill2_catalog))
+    if no_drill2:
+        drills2 = np.concatenate(([-1], drills2))
+
+    corner, small = (index.ravel() for index in np.meshgrid(drills, drills2, indexing="ij"))
+    drill2_size = np.concatenate(([0.0], drill2_catalog.sizes))[small + 1]
+    batch = HexHoleBatch(hex_size, catalog.sizes[corner], drill2_size, shape)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        overdrill = batch.overdrill_area(exact)
+        underdrill = batch.underdrill_area(exact)
+        flat_available = batch.flat_available()
+        clearance = drill2_walls(batch)
+        feasible = (batch.status == STATUS_OK) & np.isfinite(overdrill) & (underdrill > 0) & (clearance >= batch.min_wall - 1e-9)
+
+    keep = np.flatnonzero(feasible)
+    return {"corner": corner[keep], "small": small[keep],
+            "drill_size": batch.drill_size[keep], "drill2_size": drill2_size[keep],
+            "overdrill_area": overdrill[keep], "underdrill_area": underdrill[keep], "flat_available": flat_available[keep]}
+
+
+def drill2_walls(batch):
+    """ smallest wall between a small hole and a corner hole or another small hole, inf without small drills
+
+        Same as checking every pair of holes, but from the symmetry: the small holes are
+        all drill2_distance from the center at corner angles +/- drill2_angle, so the
+        closest holes are the ones at the nearest angles either side.
+
+    """
+    distance = batch.drill2_distance()
+    angle = np.radians(batch.drill2_angle())
+    side = math.radians(batch.side_angle)
+
+    # Law of cosines to the corner holes at the small hole's own and the next corner
+    corner = np.minimum(np.hypot(distance - batch.center_to_drill * np.cos(angle), batch.center_to_drill * np.sin(angle)),
+                        np.hypot(distance - batch.center_to_drill * np.cos(side - angle), batch.center_to_drill * np.sin(side - angle)))
+    # Chords to the pair at the same corner and the nearest one at the next corner
+    small = 2 * distance * np.sin(np.minimum(np.abs(2 * angle), np.abs(side - 2 * angle)) / 2)
+
+    walls = np.minimum(corner - batch.drill_radius - batch.drill2_radius, small - batch.drill2_size)
+    return np.where(batch.drill2_radius > 0, walls, np.inf)
+
+
+def pareto_front(objectives):
+    """ indexes of the rows of objectives (n, k) that no other row dominates, all objectives minimized
+
+        Rows with equal objectives are kept once.
+
+    """
+    objectives = np.asarray(objectives, dtype=float)
+    if len(objectives) == 0:
+        return np.zeros(0, dtype=int)
+
+    # Sorted lexicographically a row can only be dominated by one before it, and
+    # duplicates are next to each other
+    order = np.lexsort(objectives.T[::-1])
+    objectives = objectives[order]
+    unique = np.ones(len(order), dtype=bool)
+    unique[1:] = (objectives[1:] != objectives[:-1]).any(axis=1)
+    order, objectives = order[unique], objectives[unique]
+
+    front = []
+    front_objectives = np.empty((0, objectives.shape[1]))
+    for idx, row in enumerate(objectives):
+        if not (front_objectives <= row).all(axis=1).any():
+            front.append(order[idx])
+            front_objectives = np.vstack((front_objectives, row))
+    return np.array(front, dtype=int)
+
+
+def drill_pairs(hex_size, catalog=None, drill2_catalog=None, no_drill2=True, exact=False, shape=HexHole):
+    """ the Pareto front of catalog drill pairs for hex_size as a list of dicts, by over drill area """
+    catalog = DrillCatalog.standard() if catalog is None else catalog
+    drill2_catalog = catalog if drill2_catalog is None else drill2_catalog
+    pairs = evaluate_pairs(hex_size, catalog, drill2_catalog, no_drill2, exact, shape)
+
+    # With the closed form areas the over drill and flat are fixed by the corner drill,
+    # so only the small drill with the least under drill can be on the front.  Reducing
+    # to those first keeps the dominance pass down to one row per corner drill
+    if exact:
+        best = np.arange(len(pairs["corner"]))
+    else:
+        order = np.lexsort((pairs["underdrill_area"], pairs["corner"]))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = pairs["corner"][order][1:] != pairs["corner"][order][:-1]
+        best = order[first]
+
+    objectives = np.column_stack((pairs["overdrill_area"][best], pairs["underdrill_area"][best], -pairs["flat_available"][best]))
+    front = best[pareto_front(objectives)]
+    front = front[np.argsort(pairs["overdrill_area"][front], kind="stable")]
+
+    results = []
+    for idx in front:
+        small = pairs["small"][idx]
+        results.append({"drill": catalog.names[pairs["corner"][idx]], "drill_size": pairs["drill_size"][idx],
+                        "drill2": drill2_catalog.names[small] if small >= 0 else "",
+                        "drill2_size": pairs["drill2_size"][idx],
+                        "overdrill_area": pairs["overdrill_area"][idx], "underdrill_area": pairs["underdrill_area"][idx],
+                        "ratio": pairs["overdrill_area"][idx] / pairs["underdrill_area"][idx],
+                        "flat_available": pairs["flat_available"][idx]})
+    return results
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pareto front of corner / small drill pairs from a drill catalog")
+    parser.add_argument("hex_size", type=float)
+    parser.add_argument("--sets", nargs="*", choices=sorted(SETS), default=["fractional", "number", "letter", "metric"], help="standard drill sets in the rack")
+    parser.add_argument("--catalog", help="csv of name,size for extra drills")
+    parser.add_argument("--no-drill2", action="store_true", help="only corner drills, no small drills")
+    parser.add_argument("--exact", action="store_true", help="exact areas from the clipping engine (slower)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    catalog = DrillCatalog.standard(args.sets)
+    if args.catalog:
+        catalog = catalog + DrillCatalog.from_file(args.catalog)
+
+    start = time.perf_counter()
+    if args.no_drill2:
+        results = drill_pairs(args.hex_size, catalog, DrillCatalog([]), True, args.exact)
+    else:
+        results = drill_pairs(args.hex_size, catalog, exact=args.exact)
+    logging.info("{0} drills, {1} pairs on the front in {2:.3f} s".format(len(catalog), len(results), time.perf_counter() - start))
+
+    for row in results:
+        logging.info("{0:>8} {1:.4f}  {2:>8} {3:.4f}   over {4:.6f}  under {5:.6f}  ratio {6:7.3f}  flat {7:.4f}".format(
+            row["drill"], row["drill_size"], row["drill2"], row["drill2_size"], row["overdrill_area"], row["underdrill_area"], row["ratio"], row["flat_available"]))
@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+"""G-code and Excellon drill file export
+
+   Holes go to the writers one tool group at a time as (drill size, xy array)
+   and are formatted in blocks straight into the output stream, so plates
+   with tens of thousands of holes never build the whole file in memory.
+   Coordinates are the HexHole ones (the "Corner N: X=... Y=..." labels),
+   shifted by an optional origin.
+
+       python HexExport.py 0.5 0.25 --drill2 0.0625 -o hex.nc
+       python HexExport.py 0.5 0.25 --plate pockets.csv --format excellon -o plate.drl
+
+"""
+
+__author__ = "John Sheehan"
+__email__ = "jennasysen@gmail.com"
+__version__ = "1.0.0"
+__date__ = "Oct-18-2026"
+
+
+import argparse
+import csv
+import sys
+
+import numpy as np
+
+
+# Rows formatted per write
+BLOCK = 4096
+
+
+def hexhole_groups(hole, origin=(0.0, 0.0), main=True):
+    """ (drill size, xy) groups for one HexHole: the main hole, corner holes and small holes """
+    origin = np.asarray(origin, dtype=float)
+    if main:
+        yield hole.hex_size, origin[None, :]
+    yield hole.drill_size, np.array(hole.drill_locations()) + origin
+    if hole.drill2_radius > 0:
+        locations = np.array(hole.drill2_locations()) + origin
+        yield hole.drill2_size, locations[np.isfinite(locations).all(axis=1)]
+
+
+def plan_groups(plan, origin=(0.0, 0.0)):
+    """ (drill size, xy) groups of a HexPlate DrillPlan, in its drilling order """
+    origin = np.asarray(origin, dtype=float)
+    for size, first, stop in plan.groups:
+        yield size, np.column_stack((plan.ops["x"][first:stop], plan.ops["y"][first:stop])) + origin
+
+
+def _lines(xy, pattern):
+    # pattern formatted for each row in blocks, yields text ready to write
+    for start in range(0, len(xy), BLOCK):
+        yield "".join(pattern.format(x, y) for x, y in xy[start:start + BLOCK].tolist())
+
+
+class GcodeWriter:
+    """Canned drilling cycles, one tool change per group
+
+       cycle is G81 (drill) or G83 (peck, every peck inches).  depth is the
+       final Z, retract the R plane and safe_z the height for rapids and tool
+       changes.  Units are the HexHole ones (inches, G20), metric=True writes
+       G21 for sizes given in mm.
+
+    """
+
+    def __init__(self, stream, cycle="G81", depth=-0.25, retract=0.1, safe_z=1.0, feed=5.0, peck=0.05, speed=None, digits=4, metric=False):
+        if cycle not in ("G81", "G83"):
+            raise ValueError("Unsupported drilling cycle: {0}".format(cycle))
+        self.stream = stream
+        self.cycle = cycle
+        self.depth = depth
+        self.retract = retract
+        self.safe_z = safe_z
+        self.feed = feed
+        self.peck = peck
+        self.speed = speed
+        self.digits = digits
+        self.metric = metric
+        self.tool = 0
+        self.holes = 0
+
+
+    def _number(self, value):
+        return "{0:.{1}f}".format(value, self.digits)
+
+
+    def begin(self):
+        self.stream.write("%\n(Drilled hex holes)\n{0} G90 G17 G80\nG0 Z{1}\n".format("G21" if self.metric else "G20", self._number(self.safe_z)))
+
+
+    def group(self, size, xy):
+        """ tool change and one canned cycle over every hole in xy """
+        if len(xy) == 0:
+            return
+        self.tool += 1
+        number = self._number
+        self.stream.write("(T{0} drill {1})\nT{0} M6\n".format(self.tool, number(size)))
+        if self.speed:
+            self.stream.write("S{0:.0f} M3\n".format(self.speed))
+        self.stream.write("G0 X{0} Y{1}\n".format(number(xy[0][0]), number(xy[0][1])))
+
+        cycle = "{0} X{1} Y{2} Z{3} R{4}".format(self.cycle, number(xy[0][0]), number(xy[0][1]), number(self.depth), number(self.retract))
+        if self.cycle == "G83":
+            cycle += " Q{0}".format(number(self.peck))
+        self.stream.write(cycle + " F{0}\n".format(number(self.feed)))
+
+        # The cycle is modal, the other holes only need their position
+        pattern = "X{{0:.{0}f}} Y{{1:.{0}f}}\n".format(self.digits)
+        for text in _lines(xy[1:], pattern):
+            self.stream.write(text)
+        self.stream.write("G80\nG0 Z{0}\n".format(number(self.safe_z)))
+        self.holes += len(xy)
+
+
+    def end(self):
+        self.stream.write("M5\nM30\n%\n")
+
+
+class ExcellonWriter:
+    """Excellon drill file, the tool table needs every drill size up front
+
+       Coordinates are written with a decimal point, which is read the same
+       whatever the reader assumes for zero suppression.
+
+    """
+
+    def __init__(self, stream, sizes, digits=4, metric=False):
+        self.stream = stream
+        self.sizes = list(dict.fromkeys(sizes))
+        self.digits = digits
+        self.metric = metric
+        self.holes = 0
+
+
+    def _tool(self, size):
+        return self.sizes.index(size) + 1
+
+
+    def begin(self):
+        self.stream.write("M48\n{0},LZ\n".format("METRIC" if self.metric else "INCH"))
+        for idx, size in enumerate(self.sizes):
+            self.stream.write("T{0:02d}C{1:.{2}f}\n".format(idx + 1, size, self.digits))
+        self.stream.write("%\nG90\nG05\n")
+
+
+    def group(self, size, xy):
+        if len(xy) == 0:
+            return
+        self.stream.write("T{0:02d}\n".format(self._tool(size)))
+        pattern = "X{{0:.{0}f}}Y{{1:.{0}f}}\n".format(self.digits)
+        for text in _lines(xy, pattern):
+            self.stream.write(text)
+        self.holes += len(xy)
+
+
+    def end(self):
+        self.stream.write("T00\nM30\n")
+
+
+def export(writer, groups):
+    """ writes (drill size, xy) groups through a writer, returns the number of holes """
+    writer.begin()
+    for size, xy in groups:
+        writer.group(size, np.asarray(xy, dtype=float))
+    writer.end()
+    return writer.holes
+
+
+def export_gcode(path, groups, **options):
+    """ writes groups to a G-code file (options are GcodeWriter's), returns the number of holes """
+    with open(path, "w", buffering=1 << 16) as stream:
+        return export(GcodeWriter(stream, **options), groups)
+
+
+def export_excellon(path, groups, sizes, **options):
+    """ writes groups to an Excellon file, sizes are all of the drill sizes used, returns the number of holes """
+    with open(path, "w", buffering=1 << 16) as stream:
+        return export(ExcellonWriter(stream, sizes, **options), groups)
+
+
+def _read_plate(path):
+    centers, rotations = [], []
+    with open(path, newline="") as stream:
+        for row in csv.reader(stream):
+            try:
+                values = [float(value) for value in row if value.strip()]
+            except ValueError:
+                # Header line
+                continue
+            if len(values) >= 2:
+                centers.append(values[:2])
+                rotations.append(values[2] if len(values) > 2 else 0.0)
+    return centers, rotations
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export hex hole drill locations as G-code or an Excellon drill file")
+    parser.add_argument("hex_size", type=float)
+    parser.add_argument("drill_size", type=float)
+    parser.add_argument("--drill2", type=float, default=0.0, help="small drill size")
+    parser.add_argument("--plate", help="csv of pocket x,y[,rotation] for a plate layout")
+    parser.add_argument("--origin", nargs=2, type=float, default=(0.0, 0.0), metavar=("X", "Y"))
+    parser.add_argument("--no-main", action="store_true", help="leave out the main hole")
+    parser.add_argument("--format", choices=("gcode", "excellon"), default="gcode")
+    parser.add_argument("--cycle", choices=("G81", "G83"), default="G81")
+    parser.add_argument("--depth", type=float, default=-0.25)
+    parser.add_argument("--retract", type=float, default=0.1)
+    parser.add_argument("--feed", type=float, default=5.0)
+    parser.add_argument("--peck", type=float, default=0.05)
+    parser.add_argument("-o", "--output", default="-", help="output file, - for stdout")
+    args = parser.parse_args()
+
+    if args.plate:
+        from HexPlate import HexPlate
+        centers, rotations = _read_plate(args.plate)
+        plan = HexPlate(centers, args.hex_size, args.drill_size, args.drill2, rotations).plan()
+        if args.no_main:
+            plan.groups = [group for group in plan.groups if group[0] != round(args.hex_size, 6)]
+        sizes = [size for size, _, _ in plan.groups]
+        groups = plan_groups(plan, args.origin)
+    else:
+        from HexHole import HexHole
+        hole = HexHole(args.hex_size, args.drill_size, args.drill2)
+        if hole.status:
+            sys.stderr.write(hole.status + "\n")
+        groups = list(hexhole_groups(hole, args.origin, not args.no_main))
+        sizes = [size for size, _ in groups]
+
+    stream = sys.stdout if args.output == "-" else open(args.output, "w", buffering=1 << 16)
+    try:
+        if args.format == "gcode":
+            writer = GcodeWriter(stream, args.cycle, args.depth, args.retract, feed=args.feed, peck=args.peck)
+        else:
+            writer = ExcellonWriter(stream, sizes)
+        holes = export(writer, groups)
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+    sys.stderr.write("{0} holes written\n".format(holes))
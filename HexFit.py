@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""Best fit drill size solver"""
+
+__author__ = "John Sheehan"
+__email__ = "jennasysen@gmail.com"
+__version__ = "1.0.0"
+__date__ = "Oct-18-2026"
+
+
+import math
+
+import numpy as np
+
+from HexBatch import HexHoleBatch
+from HexGrid import DrillGrid
+from HexHole import HexHole, grid_hole
+
+
+def fit_ratio(batch, exact=False):
+    """ over drill / under drill ratio of each part
+
+        Nothing left under drilled counts as an infinite ratio and a NaN (from the
+        closed form areas) as not reached, so the ratio rises with the drill size.
+
+    """
+    underdrill = batch.underdrill_area(exact)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ratio = np.where(underdrill > 0, batch.overdrill_area(exact) / underdrill, np.inf)
+    return np.where(np.isnan(underdrill), -np.inf, ratio)
+
+
+def best_fit(hex_size, ratio=1.0, increment=HexHole.grid, drill2_size=0.0, exact=False, shape=HexHole):
+    """ finds the smallest drill size on the increment grid where over drill / under drill reaches ratio
+
+        Same answer as stepping up from the minimum drill size one increment at a time
+        (wherever the ratio rises with the drill size), but the ratio is bisected over
+        the allowed drill range and only the grid sizes around the crossing are checked.
+        Works on arrays of hex sizes; parts that never reach the ratio get the maximum
+        allowed drill size.  exact=True uses the HexArea clipping engine for the areas,
+        shape is the HexHole class (polygon).  increment is a HexGrid DrillGrid or a
+        size in inches, the answers are sizes on that grid and the drill range is
+        clamped on it too.
+
+    """
+    scalar = np.ndim(hex_size) == 0 and np.ndim(drill2_size) == 0
+    grid = DrillGrid.of(increment)
+    increment = grid.step
+    shape = grid_hole(shape, grid)
+
+    # Clamping a zero drill size gives the allowed range
+    low = HexHoleBatch(hex_size, 0.0, drill2_size, shape)
+    high = HexHoleBatch(low.hex_size, low.corner_to_corner, low.drill2_size, shape)
+    hex_size, drill2_size = low.hex_size, low.drill2_size
+    lo, hi = low.drill_size, high.drill_size
+    done_low = fit_ratio(low, exact) >= ratio
+    never = ~done_low & (fit_ratio(high, exact) < ratio)
+
+    # Bisect until the crossing is bracketed by less than one increment
+    span = np.max(hi - lo, initial=0.0)
+    steps = max(0, math.ceil(math.log2(span / increment)) + 1) if span > increment else 0
+    for _ in range(steps):
+        mid = (lo + hi) / 2
+        reached = fit_ratio(HexHoleBatch(hex_size, mid, drill2_size, shape), exact) >= ratio
+        hi = np.where(reached, mid, hi)
+        lo = np.where(reached, lo, mid)
+
+    # Snap to the grid: the answer is one of the next two grid sizes above lo
+    first = np.floor(lo * grid.denominator / grid.numerator) + 1
+    candidates = HexHoleBatch(np.concatenate((hex_size, hex_size)),
+                              grid.size(np.concatenate((first, first + 1))),
+                              np.concatenate((drill2_size, drill2_size)), shape)
+    reached = (fit_ratio(candidates, exact) >= ratio).reshape(2, -1)
+    sizes = candidates.drill_size.reshape(2, -1)
+    drill = np.where(reached[0], sizes[0], sizes[1])
+
+    # Where the ratio dips back near the crossing neither may reach it, step those up the
+    # grid until one does (or the maximum size is reached, as never)
+    index = np.where(reached[0], first, first + 1)
+    short = ~(reached[0] | reached[1] | done_low | never)
+    while short.any():
+        index[short] += 1
+        trial = HexHoleBatch(hex_size[short], grid.size(index[short]), drill2_size[short], shape)
+        drill[short] = trial.drill_size
+        short[short] = (fit_ratio(trial, exact) < ratio) & (trial.drill_size < high.drill_size[short])
+
+    drill = np.where(done_low, low.drill_size, drill)
+    drill = np.where(never, high.drill_size, drill)
+    return float(drill[0]) if scalar else drill
@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+"""Exact drill size grids
+
+   A DrillGrid is a rational increment (1/64", 1/128", 0.1 mm) and every
+   drill size on it is a whole number of steps.  Sizes are worked out from
+   the step index as one correctly rounded division, so the same index always
+   gives the same float whichever way it was reached (stepping up and down,
+   clamping, best fit) and sizes hash exactly as cache keys.
+
+   Labels are made from the index with integer arithmetic and memoized, so
+   each size is formatted once.
+
+       grid = GRIDS["1/64"]
+       grid.up(0.25), grid.label(0.296875)          # 0.265625, '19/64'
+
+"""
+
+__author__ = "John Sheehan"
+__email__ = "jennasysen@gmail.com"
+__version__ = "1.0.0"
+__date__ = "Oct-18-2026"
+
+
+import fractions
+import functools
+import math
+
+
+# Fraction of an inch per mm
+MM = fractions.Fraction(5, 127)
+
+
+@functools.lru_cache(maxsize=4096)
+def fraction_label(numerator, denominator):
+    """ '1-3/8' style label of numerator / denominator (integers), reduced """
+    whole, numerator = divmod(numerator, denominator)
+    common = math.gcd(numerator, denominator)
+    numerator, denominator = numerator // common, denominator // common
+    if numerator == 0:
+        return "{0}".format(whole)
+    elif whole != 0:
+        return "{0}-{1}/{2}".format(whole, numerator, denominator)
+    else:
+        return "{0}/{1}".format(numerator, denominator)
+
+
+class DrillGrid:
+    """Drill sizes in whole steps of an exact increment, in inches
+
+       increment is a fractions.Fraction (or anything it takes) of an inch,
+       or of a mm with metric=True.  margin is the clearance kept from the
+       geometric limits when a drill size is clamped: the smallest drill has
+       to be more than margin larger than the corner to flat distance and the
+       largest more than margin smaller than the corner to center distance.
+
+    """
+
+    margin = 0.0001
+
+    # Float sizes this close to a grid size are on it
+    tolerance = 1e-9
+
+    def __init__(self, increment, metric=False, name=None):
+        increment = fractions.Fraction(increment)
+        self.metric = metric
+        self.unit_increment = increment
+        self.increment = increment * MM if metric else increment
+        self.numerator = self.increment.numerator
+        self.denominator = self.increment.denominator
+        self.step = self.size(1)
+        self.name = name or ("{0}mm".format(float(increment)) if metric else "{0}".format(increment))
+
+
+    def __repr__(self):
+        return "DrillGrid({0!r})".format(self.name)
+
+
+    def __eq__(self, other):
+        return isinstance(other, DrillGrid) and (self.increment, self.metric) == (other.increment, other.metric)
+
+
+    def __hash__(self):
+        return hash((self.increment, self.metric))
+
+
+    @classmethod
+    def of(cls, increment):
+        """ increment as a DrillGrid: a grid is returned as is, a float is taken as inches """
+        if isinstance(increment, DrillGrid):
+            return increment
+        return cls(fractions.Fraction(increment).limit_denominator(1000000))
+
+
+    def size(self, index):
+        """ the drill size index steps up the grid, one rounding from the exact value (works on arrays) """
+        return (index * self.numerator) / self.denominator
+
+
+    def index(self, size):
+        """ nearest grid step to size """
+        return int(round(size * self.denominator / self.numerator))
+
+
+    def floor(self, size):
+        """ grid step at or below size (a size within tolerance of a grid size is on it) """
+        nearest = self.index(size)
+        if abs(self.size(nearest) - size) <= self.tolerance:
+            return nearest
+        return math.floor(size * self.denominator / self.numerator)
+
+
+    def snap(self, size):
+        """ nearest grid size """
+        return self.size(self.index(size))
+
+
+    def up(self, size, steps=1):
+        """ grid size steps above size, the size itself counts as one below if it is off the grid """
+        return self.size(self.floor(size) + steps)
+
+
+    def down(self, size, steps=1):
+        """ grid size steps below size, the largest one under it first if size is off the grid """
+        index = self.floor(size)
+        if abs(self.size(index) - size) > self.tolerance:
+            index += 1
+        return self.size(index - steps)
+
+
+    def above(self, limit):
+        """ smallest grid size more than margin over limit (works on arrays) """
+        if getattr(limit, "ndim", 0):
+            import numpy as np
+            return self.size(np.ceil((limit + self.margin) * self.denominator / self.numerator))
+        return self.size(math.ceil((limit + self.margin) * self.denominator / self.numerator))
+
+
+    def below(self, limit):
+        """ largest grid size more than margin under limit (works on arrays) """
+        if getattr(limit, "ndim", 0):
+            import numpy as np
+            return self.size(np.trunc((limit - self.margin) * self.denominator / self.numerator))
+        return self.size(int((limit - self.margin) * self.denominator / self.numerator))
+
+
+    def label(self, size):
+        """ fraction or mm label of the nearest grid size, memoized per step """
+        return self._label(self.index(size))
+
+
+    @functools.lru_cache(maxsize=4096)
+    def _label(self, index):
+        if self.metric:
+            return "{0:g}mm".format(float(index * self.unit_increment))
+        return fraction_label(index * self.numerator, self.denominator)
+
+
+INCH_64 = DrillGrid(fractions.Fraction(1, 64))
+INCH_128 = DrillGrid(fractions.Fraction(1, 128))
+METRIC_TENTH = DrillGrid(fractions.Fraction(1, 10), metric=True)
+
+GRIDS = {grid.name: grid for grid in (INCH_64, INCH_128, METRIC_TENTH)}
@@ -7,196 +7,290 @@ __version__ = "1.1.1"
 __date__ = "Mar-12-2013"
 
 
-import pygame
 import logging
 import math
 
-import Util
+from HexGrid import INCH_64
 
 
 class HexHole:
     """Object for calculating hex drill
 
-       init pre-calculates some of the geometry
+       init pre-calculates some of the geometry, assigning hex_size, drill_size
+       or drill2_size (or calling set_sizes) recalculates it and drops the
+       cached small drill solution
+
+       Other regular polygons are subclasses with a different number of corners,
+       see polygon_hole().  The trig values that only depend on the corners are
+       worked out once per class, hex_size is the size across the flats.  The
+       drill size grid (clamping, arrow key steps, labels) is a class setting
+       too, grid_hole() gives a class on another grid.
 
     """
 
     corners = 6
     side_angle = 360 / corners
 
-    drill_increment = 1.0/64.0
+    grid = INCH_64
+    drill_increment = grid.step
     min_wall = 0
 
+    # Bumped whenever the closed form areas give different answers, for HexCache
+    area_version = 2
+
+    __slots__ = ("_hex_size", "_drill_size", "_drill2_size", "center_to_flat", "center_to_corner", "corner_to_corner",
+                 "flat_length", "status", "drill_radius", "drill2_radius", "center_to_drill", "_drill2_geometry", "_drill2_points", "_exact_areas")
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._make_tables()
+
+
+    @classmethod
+    def _make_tables(cls):
+        """ per class trig constants, each one the same expression the methods used to evaluate per call """
+        cls.side_angle = 360 / cls.corners
+        cls.drill_increment = cls.grid.step
+        cls._corner_cos = tuple(math.cos(math.radians(corner * cls.side_angle)) for corner in range(cls.corners))
+        cls._corner_sin = tuple(math.sin(math.radians(corner * cls.side_angle)) for corner in range(cls.corners))
+        cls._half_cos = math.cos(math.radians(cls.side_angle / 2))
+        cls._half_sin = math.sin(math.radians(cls.side_angle / 2))
+        cls._half_tan = math.tan(math.radians(cls.side_angle / 2))
+        # Circle segment cut off by a side through the corner, per radius squared / 2
+        cls._segment = math.radians(cls.side_angle) - math.sin(math.radians(cls.side_angle))
+        # A side leaves the corner at 90 - side_angle / 2 to the corner drill's center line
+        cls._wall_sin = math.sin(math.radians(90 - (cls.side_angle / 2)))
+        cls._wall_cos = math.cos(math.radians(90 - (cls.side_angle / 2)))
+
+
     def __init__(self, hex_size, hole_size, hole2_size=0.0):
-        self.hex_size = hex_size
-        self.drill_size = hole_size
-        self.drill2_size = max(0.0, hole2_size)
+        self.set_sizes(hex_size, hole_size, hole2_size)
+
+
+    def set_sizes(self, hex_size, hole_size, hole2_size=0.0):
+        """ sets all three sizes and recalculates the derived geometry """
+        self._hex_size = hex_size
+        self._drill_size = hole_size
+        self._drill2_size = max(0.0, hole2_size)
         self.center_to_flat = self.hex_size / 2
-        self.center_to_corner = self.center_to_flat / math.cos(math.radians(self.side_angle / 2))
+        self.center_to_corner = self.center_to_flat / self._half_cos
         self.corner_to_corner = self.center_to_corner * 2
-        self.flat_length = 2 * (self.center_to_flat * math.tan(math.radians(self.side_angle / 2)))  # == center_to_corner
+        self.flat_length = 2 * (self.center_to_flat * self._half_tan)  # == center_to_corner for a hex
 
         self.status = ""
 
         if self.center_to_corner - self.center_to_flat >= self.drill_size:
-            denominator = int(1 / HexHole.drill_increment)
-            new_size = max(math.ceil((self.center_to_corner - self.center_to_flat + 0.0001) * denominator) / denominator, self.drill_increment)
+            new_size = max(self.grid.above(self.center_to_corner - self.center_to_flat), self.grid.step)
             # new_size = max(self.center_to_corner - self.center_to_flat + 0.0001, self.drill_increment)
             if self.drill_size > 0.0:  # Assume starting point for best fit algorithm
                 self.status = "Drill size {0:.4f} is too small and will be set to the minimum allowed: {1:.4f}".format(self.drill_size, new_size)
-            self.drill_size = new_size
+            self._drill_size = new_size
 
             # if self.drill_size > 0.0:  # Assume starting point for best fit algorithm
             #     self.status = "Drill size {0:.4f} is too small and will be set to the minimum allowed: {1:.4f}".format(self.drill_size, self.center_to_corner - self.center_to_flat + 0.0001)
             # self.drill_size = self.center_to_corner - self.center_to_flat + 0.0001
         elif self.drill_size >= self.center_to_corner:
-            denominator = int(1 / HexHole.drill_increment)
-            new_size = int((self.center_to_corner - 0.0001) * denominator) / denominator
+            new_size = self.grid.below(self.center_to_corner)
             self.status = "Drill size {0:.4f} is too large and will be set to the maximum allowed: {1:.4f}".format(self.drill_size, new_size)
-            self.drill_size = new_size
+            self._drill_size = new_size
 
         self.drill_radius = self.drill_size / 2
         self.drill2_radius = self.drill2_size / 2
         self.center_to_drill = self.center_to_corner - self.drill_radius
+        self._drill2_geometry = None
+        self._drill2_points = None
+        self._exact_areas = None
 
         # self.min_wall = self.drill_size * 0.05
 
 
+    @property
+    def hex_size(self):
+        return self._hex_size
+
+    @hex_size.setter
+    def hex_size(self, value):
+        self.set_sizes(value, self._drill_size, self._drill2_size)
+
+
+    @property
+    def drill_size(self):
+        return self._drill_size
+
+    @drill_size.setter
+    def drill_size(self, value):
+        self.set_sizes(self._hex_size, value, self._drill2_size)
+
+
+    @property
+    def drill2_size(self):
+        return self._drill2_size
+
+    @drill2_size.setter
+    def drill2_size(self, value):
+        self.set_sizes(self._hex_size, self._drill_size, value)
+
+
 
     def drill_location(self, corner):
-        x_offset = self.center_to_drill * math.cos(math.radians((corner - 1) * self.side_angle))
-        y_offset = self.center_to_drill * math.sin(math.radians((corner - 1) * self.side_angle))
+        x_offset = self.center_to_drill * self._corner_cos[corner - 1]
+        y_offset = self.center_to_drill * self._corner_sin[corner - 1]
         return x_offset, y_offset
 
 
     def drill_locations(self):
-        corner_list = []
-        for corner in range(HexHole.corners):
-            corner_list.append(self.drill_location(corner + 1))
-        return corner_list
+        center_to_drill = self.center_to_drill
+        return [(center_to_drill * cos, center_to_drill * sin) for cos, sin in zip(self._corner_cos, self._corner_sin)]
 
 
     def corner_locations(self):
-        corner_list = []
-        for corner in range(HexHole.corners):
-            x_offset = self.center_to_corner * math.cos(math.radians(corner * self.side_angle))
-            y_offset = self.center_to_corner * math.sin(math.radians(corner * self.side_angle))
-            corner_list.append((x_offset, y_offset))
-        return corner_list
+        center_to_corner = self.center_to_corner
+        return [(center_to_corner * cos, center_to_corner * sin) for cos, sin in zip(self._corner_cos, self._corner_sin)]
 
 
-    def drill2_angle(self):
-        H = self.drill_radius * math.sin(math.radians(self.side_angle))
-        B = self.drill_radius * math.cos(math.radians(self.side_angle))
-        h = H - self.drill2_radius
-        C = self.drill_radius + self.drill2_radius + self.min_wall
-        L = ((C**2 - h**2)**0.5) + ((h / H) * B)
+    def _drill2_solve(self):
+        """ solves the small drill position once per size change, returns (distance, angle) """
+        if self._drill2_geometry is None:
+            H = self.drill_radius * self._wall_sin
+            B = self.drill_radius * self._wall_cos
+            h = H - self.drill2_radius
+            C = self.drill_radius + self.drill2_radius + self.min_wall
+            L = ((C**2 - h**2)**0.5) + ((h / H) * B)
 
-        x = self.center_to_flat - self.drill2_radius
-        z = ((x / self.center_to_flat) * (self.flat_length / 2)) - L
+            x = self.center_to_flat - self.drill2_radius
+            z = ((x / self.center_to_flat) * (self.flat_length / 2)) - L
 
-        return (self.side_angle / 2) - math.degrees(math.atan(z / x))
+            self._drill2_geometry = ((z**2 + x**2)**0.5, (self.side_angle / 2) - math.degrees(math.atan(z / x)))
+        return self._drill2_geometry
 
 
-    def drill2_distance(self):
-        H = self.drill_radius * math.sin(math.radians(self.side_angle))
-        B = self.drill_radius * math.cos(math.radians(self.side_angle))
-        h = H - self.drill2_radius
-        C = self.drill_radius + self.drill2_radius + self.min_wall
-        L = ((C**2 - h**2)**0.5) + ((h / H) * B)
+    def drill2_angle(self):
+        return self._drill2_solve()[1]
 
-        x = self.center_to_flat - self.drill2_radius
-        z = ((x / self.center_to_flat) * (self.flat_length / 2)) - L
 
-        return (z**2 + x**2)**0.5
+    def drill2_distance(self):
+        return self._drill2_solve()[0]
 
 
     def drill2_location(self, corner):
-        x1_offset = self.drill2_distance() * math.cos(math.radians(((corner - 1) * self.side_angle) + self.drill2_angle()))
-        y1_offset = self.drill2_distance() * math.sin(math.radians(((corner - 1) * self.side_angle) + self.drill2_angle()))
-        x2_offset = self.drill2_distance() * math.cos(math.radians(((corner - 1) * self.side_angle) - self.drill2_angle()))
-        y2_offset = self.drill2_distance() * math.sin(math.radians(((corner - 1) * self.side_angle) - self.drill2_angle()))
+        distance, angle = self._drill2_solve()
+        x1_offset = distance * math.cos(math.radians(((corner - 1) * self.side_angle) + angle))
+        y1_offset = distance * math.sin(math.radians(((corner - 1) * self.side_angle) + angle))
+        x2_offset = distance * math.cos(math.radians(((corner - 1) * self.side_angle) - angle))
+        y2_offset = distance * math.sin(math.radians(((corner - 1) * self.side_angle) - angle))
         return (x1_offset, y1_offset), (x2_offset, y2_offset)
 
 
     def drill2_locations(self):
-        corner_list = []
-        for corner in range(HexHole.corners):
-            loc = self.drill2_location(corner + 1)
-            corner_list.append(loc[0])
-            corner_list.append(loc[1])
-        return corner_list
-
-
-    def drill2_area(self):
+        if self._drill2_points is None:
+            corner_list = []
+            for corner in range(self.corners):
+                loc = self.drill2_location(corner + 1)
+                corner_list.append(loc[0])
+                corner_list.append(loc[1])
+            self._drill2_points = corner_list
+        return list(self._drill2_points)
+
+
+    def exact_areas(self):
+        """ (overdrill, underdrill, drill2) areas from the exact clipping engine in HexArea """
+        if self._exact_areas is None:
+            from HexArea import exact_areas
+            from HexBatch import HexHoleBatch
+            self._exact_areas = tuple(float(area[0]) for area in exact_areas(HexHoleBatch(self.hex_size, self.drill_size, self.drill2_size, shape=type(self))))
+        return self._exact_areas
+
+
+    def drill2_area(self, exact=False):
         """ calculates the area of the hex that is removed by the small drill holes """
 
+        if exact:
+            return self.exact_areas()[2]
         if self.drill2_radius == 0:
             return 0
-        elif (self.drill2_distance() - self.drill2_radius) > self.center_to_flat:
+
+        center_to_drill2 = self.drill2_distance()
+        if (center_to_drill2 - self.drill2_radius) > self.center_to_flat:
             # doesn't intersect with large hole so just return full drill area
             return (math.pi * self.drill2_radius**2) * 2
         else:
-            center_to_drill2 = self.drill2_distance()
-
             # calc intersecting angle using law of cos:  A=acos((R^2 + d^2 - r^2)/ 2Rd)
             intersecting_angle_large = math.acos((self.center_to_flat**2 + center_to_drill2**2 - self.drill2_radius**2) / (2 * self.center_to_flat * center_to_drill2))
-            # given angle, calc intersecting chord:  c=2(R*sin(A))
-            intersecting_chord = 2 * self.center_to_flat * math.sin(intersecting_angle_large)
             # given angle, calc large segment:  area=(2A - sin(2A)) * R^2) / 2
             large_segment_area = (((2 * intersecting_angle_large) - math.sin(2 * intersecting_angle_large)) * (self.center_to_flat**2)) / 2
-            # given chord, calc small angle: a = asin((c/2) / r)
-            intersecting_angle_small = math.asin((intersecting_chord/2) / self.drill2_radius)
+            # calc small angle from the far side of the small circle: a = pi - acos((r^2 + d^2 - R^2)/ 2rd),
+            # more than 90 degrees (the major segment) once its center is past the chord
+            intersecting_angle_small = math.pi - math.acos((self.drill2_radius**2 + center_to_drill2**2 - self.center_to_flat**2) / (2 * self.drill2_radius * center_to_drill2))
             # given small angle, calc small segment:  ((2a - sin(2a)) * r^2) / 2
             small_segment_area = (((2 * intersecting_angle_small) - math.sin(2 * intersecting_angle_small)) * (self.drill2_radius**2)) / 2
 
             return (small_segment_area - large_segment_area) * 2
 
 
-    def overdrill_area(self):
+    def overdrill_area(self, exact=False):
         """ calculates area of drilled hole that is outside of the hex area """
-        circle_segment_area = ((self.drill_radius**2) / 2) * (math.radians(self.side_angle) - math.sin(math.radians(self.side_angle))) * 2
-        return circle_segment_area * HexHole.corners
+        if exact:
+            return self.exact_areas()[0]
+        circle_segment_area = ((self.drill_radius**2) / 2) * self._segment * 2
+        return circle_segment_area * self.corners
 
 
     def flat(self):
         """ calculates length of flat """
-        return (self.center_to_flat * math.tan(math.radians(self.side_angle / 2))) * 2
+        return (self.center_to_flat * self._half_tan) * 2
 
 
     def flat_available(self):
         """ calculates available length of flat """
-        return self.flat() - (self.drill_size *  math.sin(math.radians(self.side_angle / 2)) * 2)
+        return self.flat() - (self.drill_size * self._half_sin * 2)
 
-    def underdrill_area(self):
+    def underdrill_area(self, exact=False):
         """ calculates the area of the hex that is not removed with the drilled holes """
 
-        # TODO: fix area calculations
+        # The closed form below assumes the small holes only cut into the main hole,
+        # exact=True handles any overlap
+        if exact:
+            return self.exact_areas()[1]
 
         # calc intersecting angle using law of cos:  A=acos((R^2 + d^2 - r^2)/ 2Rd)
         intersecting_angle_large = math.acos((self.center_to_flat**2 + self.center_to_drill**2 - self.drill_radius**2) / (2 * self.center_to_flat * self.center_to_drill))
-        # given angle, calc intersecting chord:  c=2(R*sin(A))
-        intersecting_chord = 2 * self.center_to_flat * math.sin(intersecting_angle_large)
         # given angle, calc large segment:  area=(2A - sin(2A)) * R^2) / 2
         large_segment_area = (((2 * intersecting_angle_large) - math.sin(2 * intersecting_angle_large)) * (self.center_to_flat**2)) / 2
-        # given chord, calc small angle: a = asin((c/2) / r)
-        intersecting_angle_small = math.asin((intersecting_chord/2) / self.drill_radius)
+        # calc small angle from the far side of the small circle: a = pi - acos((r^2 + d^2 - R^2)/ 2rd),
+        # more than 90 degrees (the major segment) once its center is past the chord
+        intersecting_angle_small = math.pi - math.acos((self.drill_radius**2 + self.center_to_drill**2 - self.center_to_flat**2) / (2 * self.drill_radius * self.center_to_drill))
         # given small angle, calc small segment:  ((2a - sin(2a)) * r^2) / 2
         small_segment_area = (((2 * intersecting_angle_small) - math.sin(2 * intersecting_angle_small)) * (self.drill_radius**2)) / 2
 
         # calc included hex triangle: ab/2 * 2
         hex_area = ((self.flat_length / 2 ) * self.center_to_flat)
-        # subtract 60deg large segment: (pi r^2)/6
-        drill_area = ((self.center_to_flat**2) * math.pi) / HexHole.corners
+        # subtract one side's large segment: (pi r^2)/corners
+        drill_area = ((self.center_to_flat**2) * math.pi) / self.corners
         # subtract area defined by:
-        corner_area = small_segment_area - large_segment_area - (self.overdrill_area() / HexHole.corners)
+        corner_area = small_segment_area - large_segment_area - (self.overdrill_area() / self.corners)
         # small segment - large segment - overdrill_area
         underdrill_area = hex_area - drill_area - corner_area - self.drill2_area()
 
-        return underdrill_area * HexHole.corners
+        return underdrill_area * self.corners
+
 
+    def render(self, x_screen, y_screen, cache_bytes=None):
+        """ runs the interactive display, cache_bytes is the HexDisplay frame cache budget (default from the screen size) """
+        # pygame is only loaded once there is something to show
+        import os
+        import pygame
+        from HexDisplay import HexDisplay
+        import HexProfile
+        import Util
 
-    def render(self, x_screen, y_screen):
+        # HEXPROFILE=1 times the drawing stages, HEXPROFILE=<file> also writes a cProfile session
+        profile_path = os.environ.get("HEXPROFILE", "")
+        show_profile = False
+        show_coverage = False
+        if profile_path:
+            HexProfile.enable()
+            if profile_path != "1":
+                HexProfile.start_session()
 
         pygame.init()
 
@@ -204,234 +298,173 @@ class HexHole:
         pygame.display.set_caption("Drilled Hex Hole Calculator - Version: {0}".format(__version__))
         screen.fill(HexDisplay.WHITE)
 
-        hex_display = HexDisplay(screen, self)
+        hex_display = HexDisplay(screen, self, cache_bytes)
+        hex_display.start_worker()
         input_text = ""
         self.status = ""
         mask_on = False
 
         # Draw initial display
         hex_display.draw(mask_on, input_text)
+        pygame.display.flip()
+        status_shown = False
 
-        # Draw the screen and process user input
+        # Block until there is input, then handle everything that queued up as one frame.
+        # Size changes only touch the HexHole, the frame for the new sizes is made on the
+        # display worker thread and the last finished frame is shown until it comes back
         while True:
-            pygame.time.wait(50)
-            event = pygame.event.poll()
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                return
-            if event.type == pygame.KEYDOWN:
+            events = [pygame.event.wait()] + pygame.event.get()
+            full_redraw = False
+            text_changed = False
+            drill2_changed = False
+
+            for event in events:
+                if event.type == pygame.QUIT:
+                    hex_display.stop_worker()
+                    if HexProfile.enabled:
+                        HexProfile.log_report()
+                    if profile_path not in ("", "1"):
+                        HexProfile.stop_session(profile_path)
+                    pygame.quit()
+                    return
+                if event.type == HexDisplay.FRAME_READY:
+                    full_redraw |= hex_display.show(event)
+                    continue
+                if event.type != pygame.KEYDOWN:
+                    continue
+
                 if event.key == pygame.K_SPACE:
                     mask_on = not mask_on
+                    full_redraw = True
                 elif event.key == pygame.K_UP:
-                    self.__init__(self.hex_size, (self.drill_size + HexHole.drill_increment) - (self.drill_size % HexHole.drill_increment), self.drill2_size)
-                    hex_display.__init__(screen, self)
+                    self.drill_size = self.grid.up(self.drill_size)
                 elif event.key == pygame.K_DOWN:
-                    self.__init__(self.hex_size, (self.drill_size - HexHole.drill_increment) - (self.drill_size % HexHole.drill_increment), self.drill2_size)
-                    hex_display.__init__(screen, self)
+                    self.drill_size = self.grid.down(self.drill_size)
                 elif event.key == pygame.K_RIGHT:
-                    self.__init__(self.hex_size, self.drill_size, (self.drill2_size + HexHole.drill_increment) - (self.drill2_size % HexHole.drill_increment))
-                    hex_display.__init__(screen, self)
-                    # logging.info("drill2 angle: {0:.2f}   radius: {1:.4f}".format(self.drill2_angle(), self.drill2_distance()))
-                    logging.info("drill2 area: {0:.4f}   removed: {1:.4f}".format(2 * self.drill2_radius**2 * math.pi, self.drill2_area()))
+                    self.drill2_size = self.grid.up(self.drill2_size)
+                    drill2_changed = True
                 elif event.key == pygame.K_LEFT:
-                    self.__init__(self.hex_size, self.drill_size, (self.drill2_size - HexHole.drill_increment) - (self.drill2_size % HexHole.drill_increment))
-                    hex_display.__init__(screen, self)
-                    # logging.info("drill2 angle: {0:.2f}   radius: {1:.4f}".format(self.drill2_angle(), self.drill2_distance()))
-                    logging.info("drill2 area: {0:.4f}   removed: {1:.4f}".format(2 * self.drill2_radius**2 * math.pi, self.drill2_area()))
+                    self.drill2_size = self.grid.down(self.drill2_size)
+                    drill2_changed = True
+                elif event.key == pygame.K_F3:
+                    show_profile = not show_profile
+                    HexProfile.enable()
+                    full_redraw = True
+                elif event.key == pygame.K_F4:
+                    show_coverage = not show_coverage
+                    full_redraw = True
                 elif event.key == pygame.K_BACKSPACE:
                     input_text = input_text[0:-1]
+                    text_changed = True
                 elif event.key == pygame.K_RETURN:
                     try:
                         if float(input_text) != self.hex_size:
-                            self.__init__(float(input_text), self.drill_size, self.drill2_size)
-                            hex_display.__init__(screen, self)
+                            self.hex_size = float(input_text)
                     except:
                         if len(input_text) > 0:
                             self.status = "Input text '" + input_text + "' is not a valid number!"
                     finally:
                         input_text = ""
+                        text_changed = True
                 else:
                     input_text += event.unicode
+                    text_changed = True
 
+            if drill2_changed:
+                # logging.info("drill2 angle: {0:.2f}   radius: {1:.4f}".format(self.drill2_angle(), self.drill2_distance()))
+                logging.info("drill2 area: {0:.4f}   removed: {1:.4f}".format(2 * self.drill2_radius**2 * math.pi, self.drill2_area()))
+
+            hex_display.submit()
+            full_redraw |= status_shown or len(self.status) > 0
+            if full_redraw:
+                status_shown = len(self.status) > 0
                 hex_display.draw(mask_on, input_text)
-                self.status = ""
-
-            pygame.display.flip()
-
-
-
-class HexDisplay:
-
-    # Color list
-    TRANSPARENT = (255,0,255)
-    RED = (255,0,0)
-    GREEN = (0,255,0)
-    DARKGREEN = (0,128,0)
-    BLUE = (0,0,255)
-    DARKBLUE = (0,0,128)
-    WHITE = (255,255,255)
-    BLACK = (0,0,0)
-    PINK = (255,200,200)
-    YELLOW = (255, 255, 0)
-
-    def __init__(self, screen, hexhole):
-        self.screen = screen
-        self.hexhole = hexhole
-
-        self.x_screen = screen.get_size()[0]
-        self.y_screen = screen.get_size()[1]
-        self.border = int(self.x_screen * 0.025)
-        self.x_center = int(self.x_screen / 2)
-        self.y_center = int(self.y_screen / 2)
-        self.scale_factor = (self.y_screen / self.hexhole.corner_to_corner) / 1.2
-        self.center_mark = int(self.x_screen * 0.015)
-
-        self.background = pygame.Surface(screen.get_size())
-        self.background.fill(HexDisplay.WHITE)
-        self.mask = pygame.Surface(screen.get_size())
-        self.mask.fill(HexDisplay.TRANSPARENT)
-        self.mask.set_colorkey(HexDisplay.TRANSPARENT)
-        self.overlay = pygame.Surface(screen.get_size())
-        self.overlay.fill(HexDisplay.TRANSPARENT)
-        self.overlay.set_colorkey(HexDisplay.TRANSPARENT)
-        self.info = pygame.Surface(screen.get_size())
-        self.info.fill(HexDisplay.TRANSPARENT)
-        self.info.set_colorkey(HexDisplay.TRANSPARENT)
-
-        # Draw desired hex
-        self.hex_points = [(int(x * self.scale_factor) + self.x_center, int(y * self.scale_factor) + self.y_center) for x, y in self.hexhole.corner_locations()]
-        pygame.draw.polygon(self.background, HexDisplay.BLACK, self.hex_points, 0)
-
-        # Draw main hole
-        pygame.draw.circle(self.background, HexDisplay.WHITE, (self.x_center, self.y_center), int(hexhole.center_to_flat * self.scale_factor), 0)
-        pygame.draw.circle(self.background, HexDisplay.RED, (self.x_center, self.y_center), int(hexhole.center_to_flat * self.scale_factor), 1)
-        pygame.draw.line(self.background, HexDisplay.RED, (self.x_center - self.center_mark, self.y_center), (self.x_center + self.center_mark, self.y_center), 1)
-        pygame.draw.line(self.background, HexDisplay.RED, (self.x_center, self.y_center - self.center_mark), (self.x_center, self.y_center + self.center_mark), 1)
-
-        # Draw corner holes
-        self.drill_points = [(int(x * self.scale_factor) + self.x_center, int(-y * self.scale_factor) + self.y_center) for x, y in hexhole.drill_locations()]
-        self.drill2_points = [(int(x * self.scale_factor) + self.x_center, int(-y * self.scale_factor) + self.y_center) for x, y in hexhole.drill2_locations()]
-        for pos in range(hexhole.corners):
-            pygame.draw.circle(self.mask, HexDisplay.WHITE, (self.drill_points[pos][0],self.drill_points[pos][1]), int(hexhole.drill_radius * self.scale_factor), 0)
-            pygame.draw.circle(self.mask, HexDisplay.BLUE, (self.drill_points[pos][0],self.drill_points[pos][1]), int(hexhole.drill_radius * self.scale_factor), 1)
-            pygame.draw.circle(self.overlay, HexDisplay.BLUE, (self.drill_points[pos][0],self.drill_points[pos][1]), int(hexhole.drill_radius * self.scale_factor), 0)
-            pygame.draw.circle(self.overlay, HexDisplay.BLUE, (self.drill_points[pos][0],self.drill_points[pos][1]), int(hexhole.drill_radius * self.scale_factor), 1)
-            pygame.draw.circle(self.background, HexDisplay.WHITE, (self.drill_points[pos][0],self.drill_points[pos][1]), int(hexhole.drill_radius * self.scale_factor), 0)
-            pygame.draw.circle(self.background, HexDisplay.BLUE, (self.drill_points[pos][0],self.drill_points[pos][1]), int(hexhole.drill_radius * self.scale_factor), 1)
-            pygame.draw.line(self.background, HexDisplay.BLUE, (self.drill_points[pos][0] - self.center_mark, self.drill_points[pos][1]), (self.drill_points[pos][0] + self.center_mark, self.drill_points[pos][1]), 1)
-            pygame.draw.line(self.background, HexDisplay.BLUE, (self.drill_points[pos][0], self.drill_points[pos][1] - self.center_mark), (self.drill_points[pos][0], self.drill_points[pos][1] + self.center_mark), 1)
-
-        #Overlays
-        pygame.draw.polygon(self.overlay, HexDisplay.TRANSPARENT, self.hex_points, 0)
-        # pygame.draw.polygon(mask, HexDisplay.RED, hex_points, 1)
-        pygame.draw.polygon(self.overlay, HexDisplay.BLACK, self.hex_points, 1)
-        pygame.draw.circle(self.mask, HexDisplay.WHITE, (self.x_center, self.y_center), int(hexhole.center_to_flat * self.scale_factor), 0)
-
-        tmp_color = HexDisplay.RED
-        for pos in range(hexhole.corners * 2):
-            if hexhole.drill2_radius > 0:
-                pygame.draw.circle(self.background, tmp_color, (self.drill2_points[pos][0],self.drill2_points[pos][1]), int(hexhole.drill2_radius * self.scale_factor), 1)
-                tmp_color = HexDisplay.BLUE
-
-        #Text
-        # f_Info = pygame.font.SysFont(pygame.font.get_default_font(), int(self.x_screen * 0.025))
-        # f_InfoI = pygame.font.SysFont(pygame.font.get_default_font(), int(self.x_screen * 0.025), italic=True)
-        f_Info = pygame.font.SysFont("Arial", int(self.x_screen * 0.02))
-        f_InfoI = pygame.font.SysFont("Arial", int(self.x_screen * 0.015), italic=True)
-        self.lblHexSize = f_Info.render("Hex Size: {0:.4f}".format(hexhole.hex_size), True, HexDisplay.DARKBLUE)
-        self.lblHoleSize = f_Info.render("Corner Hole Size: {0:.4f}  ({1})".format(hexhole.drill_size, Util.getFraction(hexhole.drill_size, int(1 / HexHole.drill_increment))), True, HexDisplay.DARKBLUE)
-        self.lblHole2Size = f_Info.render("Small Hole Size: {0:.4f}  ({1})".format(hexhole.drill2_size, Util.getFraction(hexhole.drill2_size, int(1 / HexHole.drill_increment))), True, HexDisplay.DARKBLUE)
-
-        self.lblInstructionsHex = f_InfoI.render("Type a number and press [ Enter ] to change the hex size", True, HexDisplay.DARKGREEN)
-        self.lblInstructionsHexRect = self.lblInstructionsHex.get_rect()
-        self.lblInstructionsHexRect.right = self.x_screen - self.border
-        self.lblInstructionsHexRect.top = self.border
-        self.lblInstructionsSize = f_InfoI.render("Press Up/Down arrows to change corner drill size", True, HexDisplay.DARKGREEN)
-        self.lblInstructionsSizeRect = self.lblInstructionsSize.get_rect()
-        self.lblInstructionsSizeRect.right = self.x_screen - self.border
-        self.lblInstructionsSizeRect.top = self.border * 2
-        self.lblInstructionsSize2 = f_InfoI.render("Press Left/Right arrows to change small drill size", True, HexDisplay.DARKGREEN)
-        self.lblInstructionsSize2Rect = self.lblInstructionsSize.get_rect()
-        self.lblInstructionsSize2Rect.right = self.x_screen - self.border
-        self.lblInstructionsSize2Rect.top = self.border * 3
-        self.lblInstructionsMask = f_InfoI.render("Press [ space bar ] to toggle overlay", True, HexDisplay.DARKGREEN)
-        self.lblInstructionsMaskRect = self.lblInstructionsMask.get_rect()
-        self.lblInstructionsMaskRect.right = self.x_screen - self.border
-        self.lblInstructionsMaskRect.top = self.border * 4
-
-        overdrill = hexhole.overdrill_area()
-        underdrill = hexhole.underdrill_area()
-        self.lblOverDrill = f_Info.render("Over drill area: {0:.6f}".format(overdrill), True, HexDisplay.DARKBLUE)
-        self.lblUnderDrill = f_Info.render("Under drill area: {0:.6f}".format(underdrill), True, HexDisplay.DARKBLUE)
-        self.lblRatio = f_Info.render("Ratio: {0:.3f}".format(overdrill / underdrill), True, HexDisplay.DARKBLUE)
-
-        flat = hexhole.flat()
-        flat_avail = hexhole.flat_available()
-        self.lblFlat = f_Info.render("Flat Length: {0:.3f}   ({1:.1%})".format(flat_avail, flat_avail / flat), True, HexDisplay.DARKBLUE)
-        self.lblFlatRect = self.lblFlat.get_rect()
-        self.lblFlatRect.centerx = self.screen.get_rect().centerx
-        self.lblFlatRect.top = self.y_screen - (self.border * 2)
-
-        self.lblCorners = []
-        self.lblCornersTag = []
-        for idx, hole in enumerate(hexhole.drill_locations()):
-            self.lblCorners.append(f_Info.render("Corner {0}: X={1:.4f}  Y={2:.4f}".format(idx + 1, hole[0], hole[1]), True, HexDisplay.DARKBLUE))
-            self.lblCornersTag.append(f_Info.render("{0}".format(idx + 1), True, HexDisplay.DARKBLUE))
-
-
-    def draw(self, mask_on, input_text):
-        # pygame.display.update()
-        self.screen.blit(self.background, (0, 0))
-        self.screen.blit(self.overlay, (0, 0))
-
-        self.screen.blit(self.lblHexSize, (self.border, self.border))
-        Util.inputbox(self.screen, "New Size: ", input_text, (self.border, self.border * 2), int(self.x_screen * 0.14), HexDisplay.YELLOW, HexDisplay.DARKBLUE)
-
-        self.screen.blit(self.lblHoleSize, (self.border, self.border * 3))
-        self.screen.blit(self.lblHole2Size, (self.border, self.border * 4))
-        self.screen.blit(self.lblInstructionsSize, self.lblInstructionsSizeRect)
-        self.screen.blit(self.lblInstructionsSize2, self.lblInstructionsSize2Rect)
-        self.screen.blit(self.lblInstructionsHex, self.lblInstructionsHexRect)
-        self.screen.blit(self.lblInstructionsMask, self.lblInstructionsMaskRect)
-        self.screen.blit(self.lblOverDrill, (self.x_screen - int(self.x_screen * 0.25), self.y_screen - (self.border * 4)))
-        self.screen.blit(self.lblUnderDrill, (self.x_screen - int(self.x_screen * 0.25), self.y_screen - (self.border * 3)))
-        self.screen.blit(self.lblRatio, (self.x_screen - int(self.x_screen * 0.25), self.y_screen - (self.border * 2)))
-        self.screen.blit(self.lblFlat, self.lblFlatRect)
-
-        for pos in range(self.hexhole.corners):
-            self.screen.blit(self.lblCorners[pos], (self.border, self.y_screen - (self.border * self.hexhole.corners) - self.border + (self.border * pos)))
-            self.screen.blit(self.lblCornersTag[pos], (self.drill_points[pos][0] + int(self.center_mark / 2), self.drill_points[pos][1] + int(self.center_mark / 2)))
-
-        if mask_on:
-            self.screen.blit(self.mask, (0, 0))
-
-        if len(self.hexhole.status) > 0:
-            status_text = pygame.font.SysFont("Arial", int(self.x_screen * 0.018)).render(self.hexhole.status, True, HexDisplay.RED)
-            status_rect = status_text.get_rect()
-            status_rect.centerx = self.screen.get_rect().centerx
-            status_rect.top = self.y_screen - self.border
-            self.screen.blit(status_text, status_rect)
-            logging.warning(self.hexhole.status)
-            # print(self.hexhole.status)
+                if show_coverage:
+                    hex_display.draw_coverage()
+                if show_profile:
+                    HexProfile.draw_overlay(screen, (hex_display.border, hex_display.border * 6), int(x_screen * 0.012))
+                pygame.display.flip()
+            elif text_changed:
+                pygame.display.update(hex_display.draw_input(mask_on, input_text))
+            else:
+                continue
+
+            self.status = ""
+            logging.debug("frame times: {0} events, refresh {1:.2f} ms  draw {2:.2f} ms".format(len(events), *hex_display.frame_stats()))
+            logging.debug("text cache: {0}".format(Util.text_cache))
+            logging.debug("frame cache: {0}, {1:.1f} MB".format(hex_display.frames, hex_display.frames.bytes / 2**20))
+
+
+
+HexHole._make_tables()
 
+_polygon_holes = {HexHole.corners: HexHole}
+_grid_holes = {}
 
 
+def polygon_hole(corners, grid=None):
+    """ the HexHole class for a regular polygon with this many corners (4 for a square), made once per count
+
+        grid is a HexGrid DrillGrid for the drill sizes, default the HexHole one.
+
+    """
+    if corners < 3:
+        raise ValueError("A polygon needs at least 3 corners, not {0}".format(corners))
+    if corners not in _polygon_holes:
+        _polygon_holes[corners] = type("PolygonHole{0}".format(corners), (HexHole,), {"corners": corners, "__slots__": ()})
+    return _polygon_holes[corners] if grid is None else grid_hole(_polygon_holes[corners], grid)
+
+
+def grid_hole(shape, grid):
+    """ shape (a HexHole class) with its drill sizes on grid instead, made once per shape and grid """
+    if grid == shape.grid:
+        return shape
+    if (shape, grid) not in _grid_holes:
+        _grid_holes[(shape, grid)] = type(shape.__name__, (shape,), {"grid": grid, "__slots__": ()})
+    return _grid_holes[(shape, grid)]
+
+
+def __getattr__(name):
+    # HexDisplay used to live in this module, load it (and pygame) on first use
+    if name == "HexDisplay":
+        from HexDisplay import HexDisplay
+        return HexDisplay
+    raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
+
 
 
 if __name__ == "__main__":
+    import os
+    import sqlite3
+    from HexCache import DEFAULT_PATH, ResultCache
+    from HexFit import best_fit
+
+    import argparse
+    from HexGrid import GRIDS
+
+    parser = argparse.ArgumentParser(description="Drilled hex hole calculator")
+    parser.add_argument("--grid", choices=sorted(GRIDS), default=HexHole.grid.name, help="drill size grid for the best fit drill, clamping and the arrow keys")
+    args = parser.parse_args()
+
     logging.basicConfig(level=logging.INFO)#, filename='HexHole.log')
     hex = 0.5
     ratio = 1.0
-    inc = 1.0/64.0
-    drill = 0.0
-    oda = 0
-    uda = 1
-
-    while oda / uda < ratio:
-        hole = HexHole(hex, drill)
-        oda = hole.overdrill_area()
-        uda = hole.underdrill_area()
-        drill = (hole.drill_size + inc) - ((hole.drill_size + inc) % inc)
+    shape = grid_hole(HexHole, GRIDS[args.grid])
+    inc = shape.grid
+
+    # A precomputed HexCache file answers with a lookup
+    drill = None
+    if os.path.exists(DEFAULT_PATH):
+        try:
+            with ResultCache() as cache:
+                drill = cache.best_fit(hex, ratio, inc)
+        except sqlite3.Error:
+            logging.exception("cache lookup failed")
+    if drill is None:
+        drill = best_fit(hex, ratio, inc)
+    hole = shape(hex, drill)
+    oda = hole.overdrill_area()
+    uda = hole.underdrill_area()
 
     locations = hole.drill_locations()
 
@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+"""Load test for HexServer
+
+   Opens a number of keep-alive connections and sends a mix of hole, best
+   fit and drill pair queries over a set of hex sizes on each of them for a
+   fixed time, then reports requests per second and latency percentiles for
+   each query type.  --spawn starts a server for the run.
+
+       python HexLoad.py --spawn --clients 64 --duration 10
+       python HexLoad.py --port 8064 --mix hole=8 best_fit=2
+
+"""
+
+__author__ = "John Sheehan"
+__email__ = "jennasysen@gmail.com"
+__version__ = "1.0.0"
+__date__ = "Oct-18-2026"
+
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+
+from HexServer import DEFAULT_PORT
+
+
+# Query type -> relative frequency
+MIX = {"hole": 6, "best_fit": 3, "drill_pairs": 1}
+
+HEX_SIZES = tuple(n / 64 for n in range(8, 129))
+
+
+def query_target(kind, rng, sizes=HEX_SIZES):
+    """ request path for a random query of kind """
+    hex_size = rng.choice(sizes)
+    if kind == "hole":
+        return "/hole?hex_size={0}&drill_size={1}".format(hex_size, round(hex_size * rng.uniform(0.2, 0.6) * 64) / 64)
+    if kind == "best_fit":
+        return "/best_fit?hex_size={0}&ratio={1}".format(hex_size, rng.choice((0.8, 1.0, 1.2)))
+    return "/drill_pairs?hex_size={0}&sets=fractional".format(hex_size)
+
+
+def percentile(times, point):
+    """ nearest rank percentile of a sorted list """
+    if not times:
+        return 0.0
+    return times[min(len(times) - 1, max(0, math.ceil(len(times) * point / 100) - 1))]
+
+
+async def client(host, port, kinds, weights, deadline, latencies, errors, rng):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            kind = rng.choices(kinds, weights)[0]
+            start = time.perf_counter()
+            writer.write("GET {0} HTTP/1.1\r\nHost: {1}\r\n\r\n".format(query_target(kind, rng), host).encode())
+            await writer.drain()
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                if name.strip().lower() == "content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+            latencies[kind].append((time.perf_counter() - start) * 1000)
+            if status != 200:
+                errors[kind] += 1
+    finally:
+        writer.close()
+
+
+async def run(host="127.0.0.1", port=DEFAULT_PORT, clients=32, duration=5.0, mix=MIX, seed=None):
+    """ runs the load, returns {kind: sorted latencies in ms}, {kind: errors} and the seconds taken """
+    kinds = list(mix)
+    weights = [mix[kind] for kind in kinds]
+    latencies = {kind: [] for kind in kinds}
+    errors = {kind: 0 for kind in kinds}
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(client(host, port, kinds, weights, deadline, latencies, errors, random.Random(rng.random())) for _ in range(clients)))
+    return {kind: sorted(times) for kind, times in latencies.items()}, errors, time.perf_counter() - start
+
+
+def report(latencies, errors, seconds):
+    """ one line per query type and one for all of them """
+    lines = []
+    rows = list(latencies.items()) + [("all", sorted(time for times in latencies.values() for time in times))]
+    for kind, times in rows:
+        failed = sum(errors.values()) if kind == "all" else errors[kind]
+        lines.append("{0:<12} {1:>8} requests {2:>9.1f} req/s   p50 {3:8.2f}  p90 {4:8.2f}  p99 {5:8.2f}  max {6:8.2f} ms  {7} errors".format(
+            kind, len(times), len(times) / seconds, percentile(times, 50), percentile(times, 90), percentile(times, 99), times[-1] if times else 0.0, failed))
+    return lines
+
+
+async def _wait_for_server(host, port, timeout=30.0):
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+async def _stats(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write("GET /stats HTTP/1.1\r\nHost: {0}\r\nConnection: close\r\n\r\n".format(host).encode())
+    data = await reader.read()
+    writer.close()
+    return json.loads(data.partition(b"\r\n\r\n")[2])
+
+
+def _mix(value):
+    # One QUERY=WEIGHT argument as (query, weight), argparse reports the ValueError
+    kind, _, weight = value.partition("=")
+    if kind not in MIX:
+        raise ValueError("unknown query {0}".format(kind))
+    return kind, float(weight or 1)
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test a HexServer")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--clients", type=int, default=32, help="concurrent connections")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds")
+    parser.add_argument("--mix", nargs="+", type=_mix, metavar="QUERY=WEIGHT", help="query mix, default hole=6 best_fit=3 drill_pairs=1")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--spawn", action="store_true", help="start a HexServer for the run")
+    parser.add_argument("--workers", type=int, help="solver processes of the spawned server")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = None
+    if args.spawn:
+        command = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "HexServer.py"), "--host", args.host, "--port", str(args.port)]
+        if args.workers:
+            command += ["--workers", str(args.workers)]
+        server = subprocess.Popen(command)
+    try:
+        asyncio.run(_wait_for_server(args.host, args.port))
+        latencies, errors, seconds = asyncio.run(run(args.host, args.port, args.clients, args.duration, dict(args.mix) if args.mix else MIX, args.seed))
+        for line in report(latencies, errors, seconds):
+            logging.info(line)
+        logging.info("server: {0}".format(asyncio.run(_stats(args.host, args.port))))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
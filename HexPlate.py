@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+"""Plates with many hex pockets: absolute drill coordinates and drilling order
+
+   Every pocket has a center, an optional rotation (degrees counter clockwise)
+   and its own hex, corner drill and small drill sizes.  All drill coordinates
+   come from one HexHoleBatch, then the holes are grouped by drill size (one
+   tool change per size, largest first) and each group is ordered with a
+   nearest neighbor tour improved by 2-opt to cut X-Y table travel.
+
+       plate = HexPlate([(1, 1), (2, 1), (1, 2)], 0.5, 0.25, 0.0625)
+       plan = plate.plan()
+       plan.travel, plan.tool_changes
+
+"""
+
+__author__ = "John Sheehan"
+__email__ = "jennasysen@gmail.com"
+__version__ = "1.0.0"
+__date__ = "Oct-18-2026"
+
+
+import math
+
+import numpy as np
+
+from HexBatch import HexHoleBatch
+
+
+# Operation kinds
+MAIN = 0
+CORNER = 1
+SMALL = 2
+
+KIND_NAMES = ("main", "corner", "small")
+
+
+class HexPlate:
+    """Hex pockets on a plate
+
+       centers is a list of (x, y), the sizes and rotation are per pocket or
+       one value for all of them.  The main hole is drilled at the pocket
+       center with a drill the size of the hex (across the flats).
+
+    """
+
+    def __init__(self, centers, hex_size, drill_size, drill2_size=0.0, rotation=0.0):
+        self.centers = np.array(centers, dtype=float, ndmin=2).reshape(-1, 2)
+        n = len(self.centers)
+        self.rotation = np.broadcast_to(np.asarray(rotation, dtype=float), (n,))
+        self.batch = HexHoleBatch(np.broadcast_to(np.asarray(hex_size, dtype=float), (n,)), drill_size, drill2_size)
+
+
+    def __len__(self):
+        return len(self.centers)
+
+
+    def _place(self, local):
+        # (pockets, holes, 2) pocket coordinates to plate coordinates
+        cos = np.cos(np.radians(self.rotation))[:, None]
+        sin = np.sin(np.radians(self.rotation))[:, None]
+        x = (local[..., 0] * cos) - (local[..., 1] * sin) + self.centers[:, None, 0]
+        y = (local[..., 0] * sin) + (local[..., 1] * cos) + self.centers[:, None, 1]
+        return np.stack((x, y), axis=-1)
+
+
+    def operations(self):
+        """ every hole on the plate as a dict of arrays: x, y, size, pocket, kind, index (hole number within its kind)
+
+            Pockets without a small drill have no small holes, holes whose position
+            can't be solved are left out.
+
+        """
+        batch = self.batch
+        n = len(self)
+        corners = batch.corners
+        with np.errstate(invalid='ignore'):
+            holes = [(MAIN, self.centers[:, None, :], batch.hex_size),
+                     (CORNER, self._place(batch.drill_locations()), batch.drill_size),
+                     (SMALL, self._place(batch.drill2_locations()), np.where(batch.drill2_radius > 0, batch.drill2_size, np.nan))]
+
+        columns = {"x": [], "y": [], "size": [], "pocket": [], "kind": [], "index": []}
+        for kind, xy, size in holes:
+            count = xy.shape[1]
+            columns["x"].append(xy[..., 0].ravel())
+            columns["y"].append(xy[..., 1].ravel())
+            columns["size"].append(np.repeat(size, count))
+            columns["pocket"].append(np.repeat(np.arange(n), count))
+            columns["kind"].append(np.full(n * count, kind))
+            columns["index"].append(np.tile(np.arange(count), n))
+        ops = {key: np.concatenate(value) for key, value in columns.items()}
+
+        keep = np.isfinite(ops["x"]) & np.isfinite(ops["y"]) & np.isfinite(ops["size"]) & (ops["size"] > 0)
+        return {key: value[keep] for key, value in ops.items()}
+
+
+    def plan(self, start=(0.0, 0.0), optimize=True, two_opt_passes=20):
+        """ drilling order grouped by drill size, returns a DrillPlan
+
+            Groups go from the largest drill to the smallest.  Within a group the
+            holes are toured from wherever the last group ended, optimize=False keeps
+            them in pocket order instead (to compare the travel).
+
+        """
+        ops = self.operations()
+        # Sizes that only differ by float noise are the same drill
+        sizes = np.round(ops["size"], 6)
+        position = np.asarray(start, dtype=float)
+
+        order = []
+        groups = []
+        for size in np.unique(sizes)[::-1]:
+            members = np.flatnonzero(sizes == size)
+            if optimize:
+                members = members[tour(np.column_stack((ops["x"][members], ops["y"][members])), position, two_opt_passes)]
+            groups.append((float(size), len(order), len(order) + len(members)))
+            order.extend(members)
+            position = np.array((ops["x"][members[-1]], ops["y"][members[-1]]))
+
+        order = np.array(order, dtype=int)
+        return DrillPlan({key: value[order] for key, value in ops.items()}, groups, start)
+
+
+class DrillPlan:
+    """Holes in drilling order with their tool groups
+
+       ops is a dict of arrays (x, y, size, pocket, kind, index) in drilling
+       order, groups a list of (drill size, first, stop) slices into them.
+
+    """
+
+    def __init__(self, ops, groups, start=(0.0, 0.0)):
+        self.ops = ops
+        self.groups = groups
+        self.start = start
+        self.tool_changes = max(0, len(groups) - 1)
+        self.travel = path_length(np.column_stack((ops["x"], ops["y"])), start)
+
+
+    def __len__(self):
+        return len(self.ops["x"])
+
+
+    def group_travel(self):
+        """ table travel within each group, from the previous group's last hole """
+        travel = []
+        position = self.start
+        for size, first, stop in self.groups:
+            points = np.column_stack((self.ops["x"][first:stop], self.ops["y"][first:stop]))
+            travel.append((size, path_length(points, position)))
+            position = points[-1]
+        return travel
+
+
+def path_length(points, start=(0.0, 0.0)):
+    """ straight line travel from start through points in order """
+    if len(points) == 0:
+        return 0.0
+    path = np.vstack((np.asarray(start, dtype=float)[None, :], points))
+    return float(np.hypot(*np.diff(path, axis=0).T).sum())
+
+
+def tour(points, start=(0.0, 0.0), two_opt_passes=20):
+    """ visiting order of points from start: nearest neighbor, then 2-opt segment reversals
+
+        The tour is an open path, it ends at the last point instead of going back
+        to start.  two_opt_passes=0 returns the nearest neighbor order.
+
+    """
+    n = len(points)
+    if n < 2:
+        return np.arange(n)
+
+    # Nearest neighbor
+    order = np.empty(n, dtype=int)
+    left = np.ones(n, dtype=bool)
+    position = np.asarray(start, dtype=float)
+    for step in range(n):
+        distance = np.where(left, np.hypot(points[:, 0] - position[0], points[:, 1] - position[1]), np.inf)
+        nearest = int(np.argmin(distance))
+        order[step] = nearest
+        left[nearest] = False
+        position = points[nearest]
+
+    # 2-opt: reversing path[i..j] swaps edges (i-1, i) and (j, j+1) for (i-1, j) and (i, j+1),
+    # with the fixed start in front and nothing after the last point
+    path = np.vstack((np.asarray(start, dtype=float)[None, :], points[order]))
+    order = np.concatenate(([-1], order))
+    for _ in range(two_opt_passes):
+        improved = False
+        for i in range(1, n):
+            a, b = path[i - 1], path[i]
+            j = np.arange(i + 1, n + 1)
+            c = path[j]
+            d = path[np.minimum(j + 1, n)]
+            has_next = j < n
+            before = math.hypot(*(b - a)) + np.where(has_next, np.hypot(*(d - c).T), 0.0)
+            after = np.hypot(*(c - a).T) + np.where(has_next, np.hypot(*(d - b).T), 0.0)
+            gain = before - after
+            best = int(np.argmax(gain))
+            if gain[best] > 1e-12:
+                stop = j[best] + 1
+                path[i:stop] = path[i:stop][::-1]
+                order[i:stop] = order[i:stop][::-1]
+                improved = True
+        if not improved:
+            break
+    return order[1:]
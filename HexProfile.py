@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+"""Opt in stage timing for HexHole and HexDisplay
+
+   enable() wraps the hot paths with timers and disable() puts the originals
+   back, so nothing is measured (or slowed down) until it is turned on:
+
+       hexhole.init           HexHole construction
+       hexhole.set_sizes      geometry recalculation (construction and size setters)
+       hexhole.*_area         the area methods (underdrill_area includes the other two)
+       display.layers         layer and label drawing for a new configuration
+       display.compose        composing the layers into a cached frame
+       display.text           label and input box text rendering
+       display.draw           blitting the frame, input box and status line
+       display.flip           pygame.display.flip / update
+
+   Stages are inclusive, a stage called from inside another counts in both.
+   Each keeps its recent times for rolling percentiles, which can be logged
+   or drawn over the display.  start_session() / stop_session() optionally
+   record a cProfile of the calling thread and every thread started while the
+   session runs (the display worker) to one pstats file.
+
+   In the render loop HEXPROFILE=1 turns it on, HEXPROFILE=<file> also
+   writes a cProfile session, and F3 toggles the on-screen overlay.
+
+"""
+
+__author__ = "John Sheehan"
+__email__ = "jennasysen@gmail.com"
+__version__ = "1.0.0"
+__date__ = "Oct-18-2026"
+
+
+import collections
+import cProfile
+import functools
+import logging
+import math
+import pstats
+import sys
+import threading
+import time
+
+
+class StageTimer:
+    """Call count, total and the most recent times (ms) of one stage"""
+
+    def __init__(self, name, window=500):
+        self.name = name
+        self.times = collections.deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        # The display worker thread adds times while the main thread reports them
+        self.lock = threading.Lock()
+
+
+    def add(self, ms):
+        with self.lock:
+            self.times.append(ms)
+            self.count += 1
+            self.total += ms
+
+
+    def percentiles(self, points=(50, 90, 99)):
+        """ nearest rank percentiles over the recent times """
+        with self.lock:
+            times = list(self.times)
+        times.sort()
+        if not times:
+            return [0.0 for _ in points]
+        return [times[min(len(times) - 1, max(0, math.ceil(len(times) * point / 100) - 1))] for point in points]
+
+
+    def __str__(self):
+        p50, p90, p99 = self.percentiles()
+        return "{0:<24} {1:>7}  p50 {2:8.3f}  p90 {3:8.3f}  p99 {4:8.3f} ms  total {5:9.1f} ms".format(self.name, self.count, p50, p90, p99, self.total)
+
+
+stages = collections.OrderedDict()
+enabled = False
+
+_installed = []
+_session = None
+_thread_sessions = []
+
+
+def timed(stage, func):
+    """ func wrapped to add its run time to the named stage """
+    timer = stages.get(stage)
+    if timer is None:
+        timer = stages[stage] = StageTimer(stage)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            timer.add((time.perf_counter() - start) * 1000)
+    return wrapper
+
+
+def _install(owner, name, stage):
+    original = owner.__dict__[name] if isinstance(owner, type) else getattr(owner, name)
+    wrapper = timed(stage, getattr(owner, name))
+    setattr(owner, name, staticmethod(wrapper) if isinstance(original, staticmethod) else wrapper)
+    _installed.append((owner, name, original))
+
+
+def enable():
+    """ wraps the HexHole, HexDisplay and pygame display hot paths with stage timers """
+    global enabled
+    if enabled:
+        return
+    from HexHole import HexHole
+
+    _install(HexHole, "__init__", "hexhole.init")
+    _install(HexHole, "set_sizes", "hexhole.set_sizes")
+    for method in ("overdrill_area", "underdrill_area", "drill2_area"):
+        _install(HexHole, method, "hexhole." + method)
+
+    # The display is only instrumented if it is already in use, the geometry never loads pygame
+    if "HexDisplay" in sys.modules:
+        import pygame
+        import Util
+        from HexDisplay import HexDisplay
+
+        _install(HexDisplay, "_update_layers", "display.layers")
+        _install(HexDisplay, "_compose", "display.compose")
+        _install(HexDisplay, "_label", "display.text")
+        _install(Util, "renderText", "display.text")
+        _install(HexDisplay, "draw", "display.draw")
+        _install(pygame.display, "flip", "display.flip")
+        _install(pygame.display, "update", "display.flip")
+    enabled = True
+
+
+def disable():
+    """ puts the original functions back, the collected times are kept """
+    global enabled
+    while _installed:
+        owner, name, original = _installed.pop()
+        setattr(owner, name, original)
+    enabled = False
+
+
+def reset():
+    stages.clear()
+
+
+def report():
+    """ one line per stage that has been called """
+    return [str(timer) for timer in stages.values() if timer.count]
+
+
+def log_report(level=logging.INFO):
+    for line in report():
+        logging.log(level, line)
+
+
+def draw_overlay(screen, pos, font_size):
+    """ draws the stage report on a dark box at pos, returns the rect drawn """
+    import pygame
+    import Util
+
+    font = Util.getFont("Courier New", font_size)
+    with Util.font_lock:
+        lines = [font.render(line, True, (255, 255, 0)) for line in report() or ["no stages timed yet"]]
+    width = max(line.get_width() for line in lines) + 8
+    height = sum(line.get_height() for line in lines) + 8
+    box = pygame.Surface((width, height))
+    box.set_alpha(200)
+    box.fill((0, 0, 0))
+    screen.blit(box, pos)
+
+    top = pos[1] + 4
+    for line in lines:
+        screen.blit(line, (pos[0] + 4, top))
+        top += line.get_height()
+    return pygame.Rect(pos, (width, height))
+
+
+def _profile_thread(frame, event, arg):
+    # Called once by each thread started during the session, which then profiles itself
+    sys.setprofile(None)
+    profile = cProfile.Profile()
+    _thread_sessions.append(profile)
+    profile.enable()
+
+
+def start_session():
+    """ starts a cProfile of the calling thread and of the threads started from now on """
+    global _session
+    _session = cProfile.Profile()
+    _thread_sessions.clear()
+    threading.setprofile(_profile_thread)
+    _session.enable()
+
+
+def stop_session(path):
+    """ stops the cProfile session and writes its pstats file, with the other threads' profiles merged in
+
+        Threads still running are included as far as they got, stop them first for a
+        complete profile.
+
+    """
+    global _session
+    if _session is None:
+        return
+    _session.disable()
+    threading.setprofile(None)
+    stats = pstats.Stats(_session)
+    for profile in _thread_sessions:
+        stats.add(profile)
+    stats.dump_stats(path)
+    logging.info("profile written to {0} ({1} threads)".format(path, 1 + len(_thread_sessions)))
+    _session = None
+    _thread_sessions.clear()
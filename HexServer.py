@@ -0,0 +1,293 @@
+#!/usr/bin/env python
+"""HTTP/JSON calculation service for machine side terminals
+
+   Standard library asyncio, no pygame.  Every query is a GET with its
+   parameters in the query string (or a POST of the same parameters as a
+   JSON object) and answers with JSON:
+
+       /hole          hex_size, drill_size, drill2_size, corners
+                      drill locations, areas and flats (as HexCli)
+       /best_fit      hex_size, ratio, drill2_size, corners, exact
+                      the best fit drill and its hole
+       /drill_pairs   hex_size, sets, no_drill2, corners, exact
+                      the HexDrills Pareto front for the standard drill sets
+       /stats         requests served, cache and pool counts
+
+   Answers are kept in an in-process LRU cache.  Best fit and drill pair
+   solves run on a process pool so the event loop keeps serving cached
+   answers and hole geometry while they run, and identical queries that
+   arrive while one is being solved wait for the same solve.
+
+       python HexServer.py --port 8064 --workers 4
+       curl "http://localhost:8064/best_fit?hex_size=0.5&ratio=1.0"
+
+   HexLoad.py is a load test for it.
+
+"""
+
+__author__ = "John Sheehan"
+__email__ = "jennasysen@gmail.com"
+__version__ = "1.0.0"
+__date__ = "Oct-18-2026"
+
+
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import logging
+import math
+import os
+import signal
+import time
+import urllib.parse
+
+from HexHole import HexHole, polygon_hole
+import Util
+
+
+DEFAULT_PORT = 8064
+
+# Longest request body read, the queries are a few numbers
+MAX_BODY = 65536
+
+# Polygons a query can ask for, each one adds a HexHole class for good
+CORNERS = range(3, 65)
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+def _float(params, name, default=None, positive=True):
+    # A finite number, over zero (or at least zero with positive=False)
+    value = params.get(name, default)
+    if value is None:
+        raise ValueError("missing {0}".format(name))
+    value = float(value)
+    if not math.isfinite(value) or value < 0 or (positive and value == 0):
+        raise ValueError("{0} must be a finite number {1} 0".format(name, "over" if positive else "of at least"))
+    return value
+
+
+def _json(value):
+    # JSON has no NaN or infinity, values that can't be worked out (small holes that can't be placed) are null
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json(item) for item in value]
+    return value
+
+
+def _bool(params, name):
+    return str(params.get(name, "")).lower() in ("1", "true", "yes", "on")
+
+
+def _shape(params):
+    corners = int(params.get("corners", HexHole.corners))
+    if corners not in CORNERS:
+        raise ValueError("corners must be {0} to {1}".format(CORNERS[0], CORNERS[-1]))
+    return polygon_hole(corners)
+
+
+def hole_query(params):
+    """ HexCli result of the hole described by params """
+    from HexCli import result
+    hole = _shape(params)(_float(params, "hex_size"), _float(params, "drill_size"), _float(params, "drill2_size", 0.0, positive=False))
+    return result(hole)
+
+
+def best_fit_query(params):
+    """ best fit drill for params, with the resulting hole """
+    from HexCli import result
+    from HexFit import best_fit
+
+    shape = _shape(params)
+    hex_size = _float(params, "hex_size")
+    drill2_size = _float(params, "drill2_size", 0.0, positive=False)
+    exact = _bool(params, "exact")
+    drill_size = best_fit(hex_size, _float(params, "ratio", 1.0), shape.grid, drill2_size, exact, shape)
+    return dict(result(shape(hex_size, drill_size, drill2_size), exact), ratio_target=_float(params, "ratio", 1.0))
+
+
+def drill_pairs_query(params):
+    """ Pareto front of standard drill pairs for params """
+    from HexDrills import SETS, DrillCatalog, drill_pairs
+
+    sets = [name for name in str(params.get("sets", ",".join(SETS))).split(",") if name]
+    unknown = [name for name in sets if name not in SETS]
+    if unknown:
+        raise ValueError("unknown drill sets: {0}".format(", ".join(unknown)))
+    catalog = DrillCatalog.standard(sets)
+    drill2_catalog = DrillCatalog([]) if _bool(params, "no_drill2") else None
+    pairs = drill_pairs(_float(params, "hex_size"), catalog, drill2_catalog, True, _bool(params, "exact"), _shape(params))
+    return {"pairs": [{key: (value if isinstance(value, str) else float(value)) for key, value in pair.items()} for pair in pairs]}
+
+
+# Path -> (query function, solved on the process pool)
+ROUTES = {"/hole": (hole_query, False),
+          "/best_fit": (best_fit_query, True),
+          "/drill_pairs": (drill_pairs_query, True)}
+
+
+class HexServer:
+    """Answers the ROUTES queries over HTTP/1.1 with keep-alive
+
+       workers is the process pool size (default: the CPU count), cache_size
+       the number of answers kept.
+
+    """
+
+    def __init__(self, workers=None, cache_size=4096):
+        self.cache = Util.LRUCache(cache_size)
+        self.workers = workers or os.cpu_count()
+        self.pool = None
+        self.pending = {}
+        self.requests = 0
+        self.solves = 0
+        self.started = time.perf_counter()
+
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT):
+        self.pool = concurrent.futures.ProcessPoolExecutor(max_workers=self.workers)
+        return await asyncio.start_server(self.handle, host, port)
+
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+
+    async def query(self, path, params):
+        """ answer dict for one query, from the cache when it was asked before """
+        if path == "/stats":
+            return self.stats()
+        if path not in ROUTES:
+            raise LookupError(path)
+        func, pooled = ROUTES[path]
+        key = (path,) + tuple(sorted((name, str(value)) for name, value in params.items()))
+
+        answer = self.cache.get(key)
+        if answer is not None:
+            return answer
+        if not pooled:
+            answer = func(params)
+        elif key in self.pending:
+            answer = await asyncio.shield(self.pending[key])
+        else:
+            future = asyncio.get_running_loop().run_in_executor(self.pool, func, params)
+            self.pending[key] = future
+            self.solves += 1
+            try:
+                answer = await future
+            finally:
+                del self.pending[key]
+        self.cache.put(key, answer)
+        return answer
+
+
+    def stats(self):
+        return {"requests": self.requests, "solves": self.solves, "pending": len(self.pending), "workers": self.workers,
+                "cache": {"entries": len(self.cache), "hits": self.cache.hits, "misses": self.cache.misses, "hit_rate": self.cache.hit_rate()},
+                "uptime": time.perf_counter() - self.started}
+
+
+    async def handle(self, reader, writer):
+        """ serves requests on one connection until the client closes it """
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, target, headers, body = request
+                status, answer = await self._answer(method, target, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                data = json.dumps(_json(answer), allow_nan=False).encode()
+                writer.write("HTTP/1.1 {0} {1}\r\nContent-Type: application/json\r\nContent-Length: {2}\r\nConnection: {3}\r\n\r\n".format(
+                    status, REASONS[status], len(data), "keep-alive" if keep_alive else "close").encode() + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            # Dropped connection or a request line that isn't HTTP
+            pass
+        finally:
+            writer.close()
+
+
+    async def _read_request(self, reader):
+        # (method, target, headers, body), None when the connection is closed
+        line = await reader.readline()
+        if not line.strip():
+            return None
+        method, target, _ = line.decode("latin-1").split(" ", 2)
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length", 0))
+        body = await reader.readexactly(length) if 0 < length <= MAX_BODY else b""
+        if length > MAX_BODY:
+            method = "TOO LARGE"
+        return method, target, headers, body
+
+
+    async def _answer(self, method, target, body):
+        self.requests += 1
+        if method == "TOO LARGE":
+            return 413, {"error": "request body over {0} bytes".format(MAX_BODY)}
+        if method not in ("GET", "POST"):
+            return 405, {"error": "only GET and POST are served"}
+        url = urllib.parse.urlsplit(target)
+        params = dict(urllib.parse.parse_qsl(url.query))
+        try:
+            if body:
+                params.update(json.loads(body))
+            return 200, await self.query(url.path, params)
+        except LookupError:
+            return 404, {"error": "unknown query {0}".format(url.path), "queries": sorted(ROUTES) + ["/stats"]}
+        except (ValueError, TypeError) as error:
+            return 400, {"error": str(error)}
+        except Exception as error:
+            logging.exception("query {0} failed".format(target))
+            return 500, {"error": str(error)}
+
+
+async def serve(host="127.0.0.1", port=DEFAULT_PORT, workers=None, cache_size=4096):
+    """ runs a HexServer until cancelled """
+    server = HexServer(workers, cache_size)
+    listener = await server.start(host, port)
+    # SIGTERM stops serving the same as Ctrl-C so the pool processes are shut down too
+    task = asyncio.current_task()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            asyncio.get_running_loop().add_signal_handler(sig, task.cancel)
+        except (NotImplementedError, AttributeError):
+            pass
+    logging.info("serving on {0}".format(", ".join(str(sock.getsockname()) for sock in listener.sockets)))
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.close()
+        logging.info("{0} requests, {1} solves".format(server.requests, server.solves))
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HTTP/JSON hex hole calculation service")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on, 0.0.0.0 for every interface")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, help="solver processes, default one per CPU")
+    parser.add_argument("--cache-size", type=int, default=4096, help="answers kept in memory")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.cache_size))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
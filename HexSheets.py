@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+"""Setup sheet images for a list of parts, without a window
+
+   Reads the same part specs as HexCli (hex_size and optionally drill_size,
+   drill2_size, ratio, plus a name for the file) and writes one PNG per part:
+   the HexDisplay diagram with the corner coordinates, areas and flat, and a
+   title line.  Runs on SDL's dummy video driver.
+
+   Each process keeps one SheetRenderer per sheet size.  A renderer holds a
+   HexDisplay (its layer surfaces and labels), the sheet surface and the
+   fonts, and draws every part onto the same surfaces, so nothing the size of
+   the sheet is allocated per part.  --workers renders on a process pool.
+
+       python HexSheets.py parts.csv -o sheets
+       python HexSheets.py parts.jsonl -o sheets --size 1280 1024 --workers 4 --mask
+
+"""
+
+__author__ = "John Sheehan"
+__email__ = "jennasysen@gmail.com"
+__version__ = "1.0.0"
+__date__ = "Oct-18-2026"
+
+
+import argparse
+import concurrent.futures
+import logging
+import os
+import re
+import struct
+import sys
+import time
+import zlib
+
+import numpy as np
+
+from HexCli import read_specs, solve
+from HexHole import HexHole
+
+
+SIZE = (1024, 768)
+
+# Parts per pool task, enough to keep the per task overhead small
+CHUNK = 16
+
+# zlib level for the PNG files, 1 writes about twice as fast as pygame.image.save for a
+# slightly larger file (the sheets are mostly flat color)
+COMPRESSION = 1
+
+_renderers = {}
+
+
+class SheetRenderer:
+    """Draws setup sheets of one size onto pre-allocated surfaces"""
+
+    def __init__(self, size=SIZE, compression=COMPRESSION):
+        import pygame
+        from HexDisplay import HexDisplay
+
+        self.size = size
+        self.compression = compression
+        self.sheet = pygame.Surface(size)
+        self.display = HexDisplay(self.sheet, HexHole(0.5, 0.0), cache_bytes=0)
+        self.title_size = int(size[0] * 0.018)
+
+
+    def render(self, hole, path, title="", mask_on=False):
+        """ draws hole on the sheet surface and saves it as path """
+        import Util
+        from HexDisplay import HexDisplay
+
+        self.display.render_to(self.sheet, hole, mask_on)
+        if title:
+            text = Util.renderText("Arial", self.title_size, title, HexDisplay.BLACK)
+            rect = text.get_rect()
+            rect.centerx = self.size[0] // 2
+            rect.top = self.display.border // 2
+            self.sheet.blit(text, rect)
+        save_png(self.sheet, path, self.compression)
+
+
+def save_png(surface, path, compression=COMPRESSION):
+    """ writes an RGB PNG of surface with the given zlib level, unfiltered rows """
+    import pygame
+
+    width, height = surface.get_size()
+    rows = np.frombuffer(pygame.image.tobytes(surface, "RGB"), dtype=np.uint8).reshape(height, width * 3)
+    data = np.hstack((np.zeros((height, 1), dtype=np.uint8), rows)).tobytes()
+
+    def chunk(kind, body):
+        return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", zlib.crc32(kind + body))
+
+    with open(path, "wb") as out:
+        out.write(b"\x89PNG\r\n\x1a\n")
+        out.write(chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+        out.write(chunk(b"IDAT", zlib.compress(data, compression)))
+        out.write(chunk(b"IEND", b""))
+
+
+def renderer(size=SIZE):
+    """ this process' SheetRenderer for size, made on first use """
+    size = tuple(size)
+    if size not in _renderers:
+        if not _renderers:
+            _init_pygame()
+        _renderers[size] = SheetRenderer(size)
+    return _renderers[size]
+
+
+def _init_pygame():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    pygame.font.init()
+
+
+def sheet_name(spec, index):
+    """ file name for a part: its name if it has one, else the index and sizes """
+    name = spec.get("name")
+    if name:
+        return re.sub(r"[^\w.-]+", "_", str(name)) + ".png"
+    return "{0:04d}_{1}.png".format(index + 1, spec.get("hex_size"))
+
+
+def render_parts(parts, directory, size=SIZE, ratio=1.0, mask_on=False):
+    """ renders (index, spec) parts to directory, returns the paths written """
+    sheets = renderer(size)
+    paths = []
+    for index, spec in parts:
+        hole = solve(spec, ratio)
+        path = os.path.join(directory, sheet_name(spec, index))
+        title = "{0}  Hex {1:.4f}  Drill {2:.4f}  Small drill {3:.4f}".format(spec.get("name") or "Part {0}".format(index + 1), hole.hex_size, hole.drill_size, hole.drill2_size)
+        sheets.render(hole, path, title, mask_on)
+        paths.append(path)
+    return paths
+
+
+def render_all(specs, directory, size=SIZE, ratio=1.0, mask_on=False, workers=1, chunk=CHUNK):
+    """ renders every spec, on a process pool if workers > 1, returns the number of sheets """
+    os.makedirs(directory, exist_ok=True)
+    parts = list(enumerate(specs))
+    if workers <= 1:
+        return len(render_parts(parts, directory, size, ratio, mask_on))
+
+    count = 0
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=_init_pygame) as pool:
+        futures = [pool.submit(render_parts, parts[start:start + chunk], directory, size, ratio, mask_on) for start in range(0, len(parts), chunk)]
+        for future in concurrent.futures.as_completed(futures):
+            count += len(future.result())
+    return count
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render setup sheet PNGs for a list of parts")
+    parser.add_argument("input", nargs="?", default="-", help="part specs file (as HexCli), - for stdin")
+    parser.add_argument("-o", "--output", default="sheets", help="directory for the PNG files")
+    parser.add_argument("--input-format", choices=("csv", "jsonl"), help="default from the file extension, csv for stdin")
+    parser.add_argument("--size", nargs=2, type=int, default=SIZE, metavar=("WIDTH", "HEIGHT"))
+    parser.add_argument("--ratio", type=float, default=1.0, help="over/under drill ratio for parts without a drill size")
+    parser.add_argument("--mask", action="store_true", help="draw with the drilled area mask on")
+    parser.add_argument("--workers", type=int, default=1, help="render processes")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    fmt = args.input_format or ("jsonl" if args.input.endswith((".jsonl", ".json")) else "csv")
+    src = sys.stdin if args.input == "-" else open(args.input, newline="")
+    try:
+        specs = list(read_specs(src, fmt))
+    finally:
+        if src is not sys.stdin:
+            src.close()
+
+    start = time.perf_counter()
+    count = render_all(specs, args.output, args.size, args.ratio, args.mask, args.workers)
+    seconds = time.perf_counter() - start
+    logging.info("{0} sheets in {1:.2f} s ({2:.1f} sheets/s)".format(count, seconds, count / seconds if seconds else 0.0))
@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+"""Design space sweeps over hex, corner drill and small drill sizes
+
+   The hex x drill x drill2 grid is split into chunks of flat indexes, each
+   chunk is evaluated with HexHoleBatch in a worker process and the rows that
+   pass the filters are appended to a CSV file as soon as the chunk finishes.
+
+       python HexSweep.py sweep.csv --hex 0.125 2 --drill 0.015625 1 --drill2 0 0.25 --min-ratio 0.5
+       python HexSweep.py --benchmark
+
+"""
+
+__author__ = "John Sheehan"
+__email__ = "jennasysen@gmail.com"
+__version__ = "1.0.0"
+__date__ = "Oct-18-2026"
+
+
+import argparse
+import concurrent.futures
+import logging
+import os
+import time
+
+import numpy as np
+
+from HexBatch import HexHoleBatch, STATUS_OK
+
+
+COLUMNS = ("hex_size", "drill_size", "drill2_size", "overdrill_area", "underdrill_area", "ratio", "flat_available", "drill2_clearance")
+
+# Sizes are written round trip exact so a row holds the sizes that were evaluated
+FORMATS = ("%.17g",) * 3 + ("%.6g",) * (len(COLUMNS) - 3)
+
+# Holes this close count as touching, tangent holes come out a few ulps either side of 0
+CLEARANCE_TOLERANCE = 1e-9
+
+
+class SweepFilter:
+    """Limits applied to each evaluated part, None turns a limit off
+
+       Parts whose drill size was clamped are dropped unless keep_clamped is set,
+       they would only repeat the minimum or maximum drill.
+
+    """
+
+    def __init__(self, min_ratio=None, max_ratio=None, min_flat=None, min_clearance=None, keep_clamped=False):
+        self.min_ratio = min_ratio
+        self.max_ratio = max_ratio
+        self.min_flat = min_flat
+        self.min_clearance = min_clearance
+        self.keep_clamped = keep_clamped
+
+
+    def mask(self, batch, ratio, flat_available, clearance):
+        keep = np.ones(len(batch), dtype=bool)
+        if not self.keep_clamped:
+            keep &= batch.status == STATUS_OK
+        if self.min_ratio is not None:
+            keep &= ratio >= self.min_ratio
+        if self.max_ratio is not None:
+            keep &= ratio <= self.max_ratio
+        if self.min_flat is not None:
+            keep &= flat_available >= self.min_flat
+        if self.min_clearance is not None:
+            keep &= clearance >= self.min_clearance - CLEARANCE_TOLERANCE
+        return keep
+
+
+def drill2_clearance(batch):
+    """ smallest wall between any small drill hole and any corner hole, inf without small drills """
+    drills = batch.drill_locations()
+    drills2 = batch.drill2_locations()
+    distance = np.sqrt(((drills2[:, :, None, :] - drills[:, None, :, :])**2).sum(axis=-1)).min(axis=(1, 2))
+    clearance = distance - batch.drill_radius - batch.drill2_radius
+    return np.where(batch.drill2_radius > 0, clearance, np.inf)
+
+
+def evaluate_chunk(hex_sizes, drill_sizes, drill2_sizes, start, stop, sweep_filter=None, exact=False):
+    """ evaluates flat grid indexes start..stop, returns (rows, evaluated) with one row per kept part """
+    idx = np.unravel_index(np.arange(start, stop), (len(hex_sizes), len(drill_sizes), len(drill2_sizes)))
+    batch = HexHoleBatch(hex_sizes[idx[0]], drill_sizes[idx[1]], drill2_sizes[idx[2]])
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        overdrill = batch.overdrill_area(exact)
+        underdrill = batch.underdrill_area(exact)
+        ratio = overdrill / underdrill
+        flat_available = batch.flat_available()
+        clearance = drill2_clearance(batch)
+
+    rows = np.column_stack((batch.hex_size, batch.drill_size, batch.drill2_size, overdrill, underdrill, ratio, flat_available, clearance))
+    if sweep_filter is not None:
+        rows = rows[sweep_filter.mask(batch, ratio, flat_available, clearance)]
+    return rows, stop - start
+
+
+def sweep(hex_sizes, drill_sizes, drill2_sizes, path, sweep_filter=None, workers=None, chunk_size=50000, exact=False):
+    """ sweeps the full grid on a process pool and streams the kept rows to a CSV file
+
+        Chunks are written in completion order.  At most two chunks per worker are in
+        flight so memory stays flat however large the grid is.  exact=True takes the areas
+        from the HexArea clipping engine.  Returns (evaluated, kept).
+
+    """
+    hex_sizes = np.asarray(hex_sizes, dtype=float)
+    drill_sizes = np.asarray(drill_sizes, dtype=float)
+    drill2_sizes = np.asarray(drill2_sizes, dtype=float)
+    total = len(hex_sizes) * len(drill_sizes) * len(drill2_sizes)
+    workers = workers or os.cpu_count()
+    chunks = iter(range(0, total, chunk_size))
+    evaluated = kept = 0
+
+    with open(path, "w") as out, concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        out.write(",".join(COLUMNS) + "\n")
+
+        def submit():
+            start = next(chunks, None)
+            if start is None:
+                return None
+            return pool.submit(evaluate_chunk, hex_sizes, drill_sizes, drill2_sizes, start, min(start + chunk_size, total), sweep_filter, exact)
+
+        pending = {future for future in (submit() for _ in range(workers * 2)) if future is not None}
+        while pending:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                rows, count = future.result()
+                np.savetxt(out, rows, fmt=FORMATS, delimiter=",")
+                evaluated += count
+                kept += len(rows)
+                future = submit()
+                if future is not None:
+                    pending.add(future)
+            logging.debug("sweep {0}/{1} evaluated, {2} kept".format(evaluated, total, kept))
+
+    return evaluated, kept
+
+
+def scaling_benchmark(path=os.devnull, max_workers=None, parts=2000000, chunk_size=50000):
+    """ runs the same sweep with 1..max_workers processes, returns [(workers, seconds, parts/s)] """
+    max_workers = max_workers or os.cpu_count()
+    hex_sizes = np.linspace(0.125, 2.0, 100)
+    drill2_sizes = np.arange(0, 17) / 64
+    drill_sizes = np.linspace(0.015625, 1.0, max(1, parts // (len(hex_sizes) * len(drill2_sizes))))
+    sweep_filter = SweepFilter(min_ratio=0.5, max_ratio=2.0)
+
+    results = []
+    for workers in range(1, max_workers + 1):
+        start = time.perf_counter()
+        evaluated, kept = sweep(hex_sizes, drill_sizes, drill2_sizes, path, sweep_filter, workers, chunk_size)
+        seconds = time.perf_counter() - start
+        results.append((workers, seconds, evaluated / seconds))
+        logging.info("{0} workers: {1} parts in {2:.2f} s, {3:,.0f} parts/s".format(workers, evaluated, seconds, evaluated / seconds))
+    return results
+
+
+def _range(values, step):
+    start, stop = values
+    return np.arange(round(start / step), round(stop / step) + 1) * step
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sweep hex x corner drill x small drill sizes")
+    parser.add_argument("output", nargs="?", default="sweep.csv")
+    parser.add_argument("--hex", nargs=2, type=float, default=(0.125, 2.0), metavar=("MIN", "MAX"))
+    parser.add_argument("--hex-step", type=float, default=1.0/64.0)
+    parser.add_argument("--drill", nargs=2, type=float, default=(1.0/64.0, 1.0), metavar=("MIN", "MAX"))
+    parser.add_argument("--drill2", nargs=2, type=float, default=(0.0, 0.25), metavar=("MIN", "MAX"))
+    parser.add_argument("--drill-step", type=float, default=1.0/64.0)
+    parser.add_argument("--min-ratio", type=float)
+    parser.add_argument("--max-ratio", type=float)
+    parser.add_argument("--min-flat", type=float)
+    parser.add_argument("--min-clearance", type=float)
+    parser.add_argument("--keep-clamped", action="store_true")
+    parser.add_argument("--exact", action="store_true", help="exact areas from the clipping engine")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    parser.add_argument("--benchmark", action="store_true", help="report throughput from 1 to --workers processes")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.benchmark:
+        scaling_benchmark(max_workers=args.workers, chunk_size=args.chunk_size)
+    else:
+        start = time.perf_counter()
+        evaluated, kept = sweep(_range(args.hex, args.hex_step), _range(args.drill, args.drill_step), _range(args.drill2, args.drill_step), args.output,
+                                SweepFilter(args.min_ratio, args.max_ratio, args.min_flat, args.min_clearance, args.keep_clamped),
+                                args.workers, args.chunk_size, args.exact)
+        logging.info("{0} parts evaluated, {1} written to {2} in {3:.2f} s".format(evaluated, kept, args.output, time.perf_counter() - start))
@@ -0,0 +1,243 @@
+#!/usr/bin/env python
+"""Monte Carlo tolerance analysis of a drilled hex hole
+
+   The drill coordinates from HexHole are exact, the machine isn't.  Every
+   sample moves each hole by a position error (normal, per axis, plus a
+   uniform backlash error) and changes its diameter by the drill's size
+   error (normal, one per drill size) plus runout (uniform oversize up to
+   the runout), then measures the resulting geometry:
+
+       flat           longest clear stretch of a flat between the holes cutting
+                      it, the shortest over all flats (flat_available nominally)
+       corner_gap     largest distance from a corner of the hex to the nearest
+                      corner hole edge, the material left in the corner
+       wall           thinnest wall between a small hole and a corner hole or
+                      another small hole, negative where they break through
+
+   Samples are NumPy arrays of every hole in chunks: a million samples take
+   about 2.5 s for a hole without small holes and about 7 s with them (one
+   core, the flats and walls then have twice the holes to check).  The
+   walls only check the neighbors that are closest without errors, as
+   HexDrills.drill2_walls does.
+
+       python HexTolerance.py 0.5 0.25 --drill2 0.0625 --position 0.0005 --runout 0.0005
+       python HexTolerance.py 0.5 0.25 --samples 5000000 --min-flat 0.2
+
+"""
+
+__author__ = "John Sheehan"
+__email__ = "jennasysen@gmail.com"
+__version__ = "1.0.0"
+__date__ = "Oct-18-2026"
+
+
+import argparse
+import functools
+import logging
+import time
+
+import numpy as np
+
+from HexHole import polygon_hole
+
+
+PERCENTILES = (0.1, 1, 5, 50, 95, 99, 99.9)
+
+# Holes reaching less than this past a flat line only touch it
+TANGENT = 1e-9
+
+# Samples evaluated per chunk, the arrays of one chunk stay within a few tens of MB
+CHUNK = 200000
+
+
+class ToleranceResult:
+    """Measured values of every sample and the limits they are checked against
+
+       metrics is a dict of arrays (flat, corner_gap and, with small holes,
+       wall), nominal the same values without errors.
+
+    """
+
+    def __init__(self, metrics, nominal, min_flat=0.0, max_corner_gap=0.001, min_wall=0.0):
+        self.metrics = metrics
+        self.nominal = nominal
+        self.samples = len(metrics["flat"])
+        self.passed = {"flat": metrics["flat"] >= min_flat,
+                       "corner_gap": metrics["corner_gap"] <= max_corner_gap}
+        if "wall" in metrics:
+            self.passed["wall"] = metrics["wall"] >= min_wall
+
+
+    def percentiles(self, points=PERCENTILES):
+        """ dict of metric name to its values at the percentile points """
+        return {name: np.percentile(values, points) for name, values in self.metrics.items()}
+
+
+    def yields(self):
+        """ fraction of the samples within each limit, and within all of them """
+        passed = {name: float(ok.mean()) for name, ok in self.passed.items()}
+        passed["all"] = float(np.logical_and.reduce(list(self.passed.values())).mean())
+        return passed
+
+
+    def report(self, points=PERCENTILES):
+        """ one line per metric with its nominal value, percentiles and yield """
+        yields = self.yields()
+        lines = ["{0:<12} {1:>9} ".format("", "nominal") + " ".join("{0:>9}".format("p{0:g}".format(point)) for point in points) + "     yield"]
+        for name, values in self.percentiles(points).items():
+            lines.append("{0:<12} {1:9.5f} ".format(name, self.nominal[name]) + " ".join("{0:9.5f}".format(value) for value in values) + "  {0:7.3%}".format(yields[name]))
+        lines.append("{0:<12} {1} samples, yield {2:.3%}".format("all", self.samples, yields["all"]))
+        return lines
+
+
+def _flat_axes(hole):
+    # Unit normal and tangent of each flat, flat k is between corners k and k + 1
+    angle = np.radians((np.arange(hole.corners) + 0.5) * hole.side_angle)
+    return np.column_stack((np.cos(angle), np.sin(angle))), np.column_stack((-np.sin(angle), np.cos(angle)))
+
+
+def _cut(center, radius, normal, tangent, distance):
+    # Where a hole crosses the flat line: the position along the flat and half the chord, NaN if it doesn't
+    # reach past it (a hole within TANGENT of the line, like a nominal small hole, only touches it)
+    x, y = center[..., 0], center[..., 1]
+    depth = distance - ((x * normal[:, 0]) + (y * normal[:, 1]))
+    with np.errstate(invalid='ignore'):
+        half = np.where(radius - depth > TANGENT, np.sqrt(radius**2 - depth**2), np.nan)
+    return (x * tangent[:, 0]) + (y * tangent[:, 1]), half
+
+
+def _clear_span(start, stop, half_flat):
+    # Longest stretch of [-half_flat, half_flat] outside every (start, stop) interval along the last
+    # axis, NaN intervals are left out
+    missing = np.isnan(start) | np.isnan(stop)
+    start = np.clip(np.where(missing, half_flat, start), -half_flat, half_flat)
+    stop = np.clip(np.where(missing, -half_flat, stop), -half_flat, half_flat)
+    order = np.argsort(start, axis=-1)
+    start = np.take_along_axis(start, order, axis=-1)
+    stop = np.maximum.accumulate(np.take_along_axis(stop, order, axis=-1), axis=-1)
+    # Clear before each interval: from the furthest end of the intervals sorted before it
+    reached = np.concatenate((np.full(start.shape[:-1] + (1,), -half_flat), stop[..., :-1]), axis=-1)
+    gaps = np.maximum(start - reached, 0.0)
+    return np.maximum(gaps.max(axis=-1), half_flat - stop[..., -1])
+
+
+def _distance(a, b):
+    return np.hypot(a[..., 0] - b[..., 0], a[..., 1] - b[..., 1])
+
+
+def measure(hole, corner_xy, corner_d, small_xy=None, small_d=None):
+    """ flat, corner_gap and wall arrays for holes shaped (samples, corners, 2) and (samples, corners)
+
+        small_xy is (samples, corners, 2, 2) and small_d (samples, corners, 2) in the
+        HexHole.drill2_locations order, + angle then - angle for each corner.
+
+    """
+    normal, tangent = _flat_axes(hole)
+    half_flat = hole.flat_length / 2
+    corner_r = corner_d / 2
+    next_corner = np.roll(np.arange(hole.corners), -1)
+
+    # Each flat can be cut by the corner holes at both its ends and the small holes beside
+    # it (the first corner's + hole and the next corner's - hole), the clear span is found
+    # from their chords sorted along it
+    cuts = [(corner_xy, corner_r), (corner_xy[:, next_corner], corner_r[:, next_corner])]
+    if small_xy is not None:
+        cuts.append((small_xy[:, :, 0], small_d[:, :, 0] / 2))
+        cuts.append((small_xy[:, next_corner, 1], small_d[:, next_corner, 1] / 2))
+    t, half = zip(*(_cut(xy, r, normal, tangent, hole.center_to_flat) for xy, r in cuts))
+    t, half = np.stack(t, axis=-1), np.stack(half, axis=-1)
+    metrics = {"flat": _clear_span(t - half, t + half, half_flat).min(axis=1)}
+
+    angle = np.radians(np.arange(hole.corners) * hole.side_angle)
+    vertex = np.column_stack((np.cos(angle), np.sin(angle))) * hole.center_to_corner
+    gap = _distance(vertex, corner_xy) - corner_r
+    metrics["corner_gap"] = np.maximum(gap, 0.0).max(axis=1)
+
+    if small_xy is not None:
+        plus, minus = small_xy[:, :, 0], small_xy[:, :, 1]
+        plus_r, minus_r = small_d[:, :, 0] / 2, small_d[:, :, 1] / 2
+        previous = np.roll(np.arange(hole.corners), 1)
+        pairs = ((plus, plus_r, corner_xy, corner_r),
+                 (plus, plus_r, corner_xy[:, next_corner], corner_r[:, next_corner]),
+                 (minus, minus_r, corner_xy, corner_r),
+                 (minus, minus_r, corner_xy[:, previous], corner_r[:, previous]),
+                 (plus, plus_r, minus, minus_r),
+                 (plus, plus_r, minus[:, next_corner], minus_r[:, next_corner]))
+        walls = functools.reduce(np.minimum, (_distance(a, b) - a_r - b_r for a, a_r, b, b_r in pairs))
+        metrics["wall"] = walls.min(axis=1)
+    return metrics
+
+
+def analyze(hole, samples=1000000, position_sigma=0.0005, backlash=0.0, diameter_sigma=0.0002, runout=0.0005,
+            min_flat=0.0, max_corner_gap=0.001, min_wall=0.0, seed=None, chunk=CHUNK):
+    """ samples the hole positions and diameters of a HexHole and returns a ToleranceResult
+
+        position_sigma is the standard deviation of each hole's X and Y error, backlash
+        the full width of a uniform error added per axis.  diameter_sigma is the
+        standard deviation of a drill's size (one draw per drill per sample), runout
+        the largest oversize a hole gets from it.  Small holes are left out when the
+        hole has none or they can't be placed.
+
+    """
+    rng = np.random.default_rng(seed)
+    corner_xy = np.array(hole.drill_locations(), dtype=float)
+    small_xy = None
+    if hole.drill2_radius > 0:
+        small_xy = np.array(hole.drill2_locations(), dtype=float).reshape(hole.corners, 2, 2)
+        if not np.isfinite(small_xy).all():
+            logging.warning("small holes can't be placed, analyzing the corner holes only")
+            small_xy = None
+
+    def holes(xy, diameter, count):
+        # Sampled centers and diameters of count samples of the holes at xy drilled with one drill
+        shape = (count,) + xy.shape
+        centers = xy + rng.normal(0.0, position_sigma, shape)
+        if backlash:
+            centers += rng.uniform(-backlash / 2, backlash / 2, shape)
+        size = diameter + rng.normal(0.0, diameter_sigma, (count,) + (1,) * (xy.ndim - 1))
+        return centers, size + (runout * rng.random(shape[:-1]))
+
+    nominal = measure(hole, corner_xy[None], np.full((1, hole.corners), hole.drill_size),
+                      None if small_xy is None else small_xy[None], None if small_xy is None else np.full((1, hole.corners, 2), hole.drill2_size))
+    if not np.isclose(nominal["flat"][0], hole.flat_available(), rtol=0.0, atol=1e-9):
+        logging.warning("nominal flat {0:.6f} is not the hole's available flat {1:.6f}, the small holes cut into it".format(nominal["flat"][0], hole.flat_available()))
+    results = {name: np.empty(samples) for name in nominal}
+    for start in range(0, samples, chunk):
+        count = min(chunk, samples - start)
+        corners = holes(corner_xy, hole.drill_size, count)
+        small = (None, None) if small_xy is None else holes(small_xy, hole.drill2_size, count)
+        for name, values in measure(hole, *corners, *small).items():
+            results[name][start:start + count] = values
+
+    return ToleranceResult(results, {name: float(value[0]) for name, value in nominal.items()}, min_flat, max_corner_gap, min_wall)
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Monte Carlo drill position and size tolerance analysis of a hex hole")
+    parser.add_argument("hex_size", type=float)
+    parser.add_argument("drill_size", type=float)
+    parser.add_argument("--drill2", type=float, default=0.0, help="small drill size")
+    parser.add_argument("--corners", type=int, default=6)
+    parser.add_argument("--samples", type=int, default=1000000)
+    parser.add_argument("--position", type=float, default=0.0005, help="hole position standard deviation per axis")
+    parser.add_argument("--backlash", type=float, default=0.0, help="uniform position error width per axis")
+    parser.add_argument("--diameter", type=float, default=0.0002, help="drill size standard deviation")
+    parser.add_argument("--runout", type=float, default=0.0005, help="largest hole oversize from runout")
+    parser.add_argument("--min-flat", type=float, default=0.0)
+    parser.add_argument("--max-corner-gap", type=float, default=0.001)
+    parser.add_argument("--min-wall", type=float, default=0.0)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    hole = polygon_hole(args.corners)(args.hex_size, args.drill_size, args.drill2)
+    if hole.status:
+        logging.warning(hole.status)
+
+    start = time.perf_counter()
+    result = analyze(hole, args.samples, args.position, args.backlash, args.diameter, args.runout,
+                     args.min_flat, args.max_corner_gap, args.min_wall, args.seed)
+    for line in result.report():
+        logging.info(line)
+    logging.info("{0} samples in {1:.2f} s".format(result.samples, time.perf_counter() - start))
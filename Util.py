@@ -7,9 +7,111 @@ __version__ = "1.0.0"
 __date__ = "Mar-06-2013"
 
 
-import pygame
+import collections
+import functools
+import threading
 
 
+class LRUCache:
+    """Dict with a size limit, the least recently used entries are dropped first
+
+       The limit is a number of entries, and optionally a total size where
+       size_of(value) gives the size of each entry.  Lookups are counted so
+       the hit rate can be logged.
+
+    """
+
+    def __init__(self, max_size=256, max_bytes=None, size_of=None):
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.size_of = size_of
+        self.entries = collections.OrderedDict()
+        self.sizes = {}
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+
+    def __len__(self):
+        return len(self.entries)
+
+
+    def __contains__(self, key):
+        return key in self.entries
+
+
+    def __str__(self):
+        return "{0} entries, {1} hits, {2} misses ({3:.1f}% hit rate)".format(len(self), self.hits, self.misses, self.hit_rate() * 100)
+
+
+    def get(self, key, default=None):
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+        self.misses += 1
+        return default
+
+
+    def put(self, key, value):
+        if key in self.entries:
+            self._drop(key)
+        self.entries[key] = value
+        if self.size_of is not None:
+            self.sizes[key] = self.size_of(value)
+            self.bytes += self.sizes[key]
+        # The newest entry is kept even if it is over the budget on its own
+        while len(self.entries) > 1 and (len(self.entries) > self.max_size or (self.max_bytes is not None and self.bytes > self.max_bytes)):
+            self._drop(next(iter(self.entries)))
+
+
+    def _drop(self, key):
+        del self.entries[key]
+        self.bytes -= self.sizes.pop(key, 0)
+
+
+    def clear(self):
+        self.entries.clear()
+        self.sizes.clear()
+        self.bytes = 0
+
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+# Fonts by (face, size, italic), SysFont does a system font lookup each time it is called
+_fonts = {}
+
+# Held while SysFonts are made or render, SDL_ttf isn't thread safe
+font_lock = threading.RLock()
+
+# Rendered text surfaces by (face, size, italic, text, color)
+text_cache = LRUCache(512)
+
+
+def getFont(face, size, italic=False):
+    import pygame
+
+    key = (face, size, italic)
+    with font_lock:
+        if key not in _fonts:
+            _fonts[key] = pygame.font.SysFont(face, size, italic=italic)
+        return _fonts[key]
+
+
+def renderText(face, size, text, color, italic=False):
+    key = (face, size, italic, text, color)
+    surface = text_cache.get(key)
+    if surface is None:
+        with font_lock:
+            surface = getFont(face, size, italic).render(text, True, color)
+        text_cache.put(key, surface)
+    return surface
+
+
+@functools.lru_cache(maxsize=4096)
 def getFraction(value, denominator):
     whole_num, remainder = divmod(value, 1)
 
@@ -28,11 +130,12 @@ def getFraction(value, denominator):
 
 
 def inputbox(screen, label, value, pos, size, bg_color, fg_color):
+    import pygame
 
     # font = pygame.font.SysFont(pygame.font.get_default_font(), int(screen.get_size()[0] * 0.025))
-    font = pygame.font.SysFont("Arial", int(screen.get_size()[0] * 0.02))
+    font_size = int(screen.get_size()[0] * 0.02)
 
-    lbl = font.render(label, True, fg_color)
+    lbl = renderText("Arial", font_size, label, fg_color)
     lbl_rect = lbl.get_rect()
 
     rect = pygame.Rect([0, 0, size - lbl_rect.width, int(screen.get_size()[0] * 0.025)])
@@ -50,7 +153,7 @@ def inputbox(screen, label, value, pos, size, bg_color, fg_color):
     if len(label) != 0:
         screen.blit(lbl, pos)
     if len(value) != 0:
-        screen.blit(font.render(value, True, fg_color), rect.topleft)
+        screen.blit(renderText("Arial", font_size, value, fg_color), rect.topleft)
 
 
 